@@ -18,6 +18,7 @@
 __version__ = "0.3.3"
 
 from enum import Enum
+from typing import Optional
 
 
 class CloudType(Enum):
@@ -48,12 +49,28 @@ class GPUTypeId(Enum):
 
     @classmethod
     def from_gpuDisplayName(cls, s: str) -> "GPUTypeId":
-        s_ = s.replace(" ", "_").upper()
-        typeId = getattr(GPUTypeId, s_, None)
+        typeId = cls.lookup_gpuDisplayName(s)
         if typeId is None:
             raise ValueError(f"Unknown GPU type: {s}")
         return typeId
 
+    @classmethod
+    def lookup_gpuDisplayName(cls, s: str) -> Optional["GPUTypeId"]:
+        """Like from_gpuDisplayName, but returns None for an unknown GPU type instead of raising"""
+        typeId = _GPU_TYPE_IDS_BY_DISPLAY_NAME.get(s)
+        if typeId is None and s is not None:
+            typeId = _GPU_TYPE_IDS_BY_DISPLAY_NAME.get(s.replace(" ", "_").upper())
+        return typeId
+
+
+# Lookup table for GPUTypeId.from_gpuDisplayName/lookup_gpuDisplayName,
+# keyed by both the member values (e.g. "NVIDIA GeForce RTX 3080 Ti") and names (e.g. "RTX_3080_TI")
+_GPU_TYPE_IDS_BY_DISPLAY_NAME = {
+    **{typeId.value: typeId for typeId in GPUTypeId},
+    **GPUTypeId.__members__,
+}
+
+
 class PodStatus(Enum):
     """
     Status (desired status) of a pod.
@@ -16,23 +16,181 @@
 # DEALINGS IN THE SOFTWARE.
 
 import argparse
-import asyncio
+import functools
+import os
 import sys
+from typing import List, Optional
 
-from gql.transport.aiohttp import AIOHTTPTransport
-from loguru import logger
-from ruamel.yaml import YAML
 import runpodpy
 
-from runpodpy.cli import create, destroy, list_pods, start, stop
-from runpodpy.runpod import RunPod
-from runpodpy.config import Config, config_builder
+from runpodpy.config import Config, config_builder, load_yaml
 from runpodpy import CloudType, GPUTypeId
 
-logger = logger.opt(colors=True)
+# Maps each command (and alias) to its handler in runpodpy.cli.
+# Handlers are resolved by name so runpodpy.cli and its dependencies
+# (gql, aiohttp, loguru) are only imported once a valid command is given.
+COMMANDS = {
+    "stop": "stop",
+    "destroy": "destroy",
+    "terminate": "destroy",
+    "start": "start",
+    "run": "start",
+    "resume": "start",
+    "create": "create",
+    "list": "list_pods",
+}
+
+# Choices of the create command's enum options, built once at import
+GPU_TYPE_CHOICES = tuple(GPUTypeId)
+CLOUD_TYPE_CHOICES = tuple(CloudType)
+
+# Subcommand spec: (name, help, aliases, [(flags, add_argument kwargs), ...]).
+# Every option is optional (required=False); options without a default fall
+# back to argparse's default of None (False for store_true).
+SUBCOMMANDS = (
+    (
+        "stop",
+        "Stop a pod",
+        [],
+        [
+            (("--podId",), dict(type=str, help="Pod id to stop")),
+            (("--all",), dict(action="store_true", help="Stop all pods")),
+        ],
+    ),
+    (
+        "destroy",
+        "Destroy a pod",
+        ["terminate"],
+        [
+            (("--podId",), dict(type=str, help="Pod id to destroy")),
+            (("--all",), dict(action="store_true", help="Destroy all pods")),
+        ],
+    ),
+    (
+        "start",
+        "Start a pod",
+        ["run", "resume"],
+        [
+            (("--podId",), dict(type=str, help="Pod id to start")),
+            (("--all",), dict(action="store_true", help="Start all pods")),
+            (("--max_bid",), dict(type=float, help="Maximum bid for the pod")),
+            (
+                ("--spot",),
+                dict(action="store_true", help="Start the pod as a spot instance"),
+            ),
+        ],
+    ),
+    (
+        "create",
+        "Create a pod",
+        [],
+        [
+            (
+                ("--spot",),
+                dict(action="store_true", help="Create the pod as a spot instance"),
+            ),
+            (("--max_bid",), dict(type=float, help="Maximum bid for the pod")),
+            (
+                ("--podName", "--machine.podName"),
+                dict(dest="machine.podName", type=str, help="Pod name to create"),
+            ),
+            (
+                ("--gpuTypeId", "--machine.gpuTypeId"),
+                dict(
+                    dest="machine.gpuTypeId",
+                    type=GPUTypeId,
+                    choices=GPU_TYPE_CHOICES,
+                    help='The GPU type to use. e.g. "NVIDIA GeForce RTX 3080 Ti"',
+                    default=GPUTypeId.RTX_3080_TI,
+                ),
+            ),
+            (
+                ("--cloudType", "--cloud"),
+                dict(
+                    dest="cloudType",
+                    type=CloudType,
+                    choices=CLOUD_TYPE_CHOICES,
+                    help="The CloudType to deploy to. e.g. COMMUNITY, SECURE",
+                    default=CloudType.COMMUNITY,
+                ),
+            ),
+            (
+                ("--imageName", "--machine.imageName"),
+                dict(
+                    dest="machine.imageName",
+                    type=str,
+                    help="The docker image to use",
+                    default="pytorch/pytorch",
+                ),
+            ),
+            (
+                ("--volumePath", "--machine.volumePath"),
+                dict(
+                    dest="machine.volumePath",
+                    type=str,
+                    help="The volume path to mount",
+                    default="/root",
+                ),
+            ),
+            (
+                ("--args", "--machine.args"),
+                dict(
+                    dest="machine.args",
+                    type=str,
+                    help='The arguments to pass to docker. e.g. "bash -c "sleep infinity""',
+                    default='bash -c "sleep infinity"',
+                ),
+            ),
+            (
+                ("--containerDiskSize", "--machine.containerDiskSize"),
+                dict(
+                    dest="machine.containerDiskSize",
+                    type=int,
+                    help="The size of the container disk (GB)",
+                    default=40,
+                ),
+            ),
+            (
+                ("--volumeSize", "--machine.volumeSize"),
+                dict(
+                    dest="machine.volumeSize",
+                    type=int,
+                    help="The size of the volume (GB)",
+                    default=40,
+                ),
+            ),
+            (
+                ("--gpuCount", "--machine.gpuCount"),
+                dict(
+                    dest="machine.gpuCount",
+                    type=int,
+                    help="The number of GPUs to use",
+                    default=1,
+                ),
+            ),
+            (
+                ("--templateId", "--machine.templateId"),
+                dict(
+                    dest="machine.templateId",
+                    type=str,
+                    help="The templateId to use",
+                    default=argparse.SUPPRESS,
+                ),
+            ),
+        ],
+    ),
+    ("list", "List pods", [], []),
+)
+
+# Subcommand spec by command name and alias
+SUBCOMMANDS_BY_NAME = {
+    name: spec for spec in SUBCOMMANDS for name in (spec[0], *spec[2])
+}
 
 
 def configure_logging(config):
+    from loguru import logger
+
     logger.remove()
     if config.debug == True:
         logger.add(sys.stderr, level="TRACE")
@@ -40,8 +198,39 @@ def configure_logging(config):
         logger.add(sys.stderr, level="INFO")
 
 
+@functools.lru_cache(maxsize=4)
+def get_transport(url: str, api_key: str):
+    """Returns the transport for url, reused for every run with the same url and api key"""
+    from gql.transport.aiohttp import AIOHTTPTransport
+
+    client_session_args = {}
+    try:
+        import orjson
+    except ImportError:
+        pass
+    else:
+        # Faster serialization of the request bodies
+        client_session_args["json_serialize"] = lambda obj: orjson.dumps(obj).decode()
+
+    # The api key is sent as a header so it stays out of the URL (and any logs of it)
+    return AIOHTTPTransport(
+        url=url,
+        headers={
+            "content-type": "application/json",
+            "Authorization": f"Bearer {api_key}",
+        },
+        client_session_args=client_session_args,
+    )
+
+
 async def run_command(config: Config, command):
     """Main function"""
+    from loguru import logger
+    from runpodpy.runpod import RunPod
+
+    # The messages of the commands may use color markup, e.g. <green>...</green>
+    logger = logger.opt(colors=True)
+
     global RUNPOD_API_KEY
     if config.runpod_api.get('API_KEY') is None:
         raise ValueError('No API_KEY found in config.runpod_api')
@@ -49,25 +238,37 @@ async def run_command(config: Config, command):
     RUNPOD_API_KEY = config.runpod_api["API_KEY"]
 
     # Connect to runpod api
-    runpod_transport = AIOHTTPTransport(
-        url=f"{config.runpod_api['URL']}?api_key={RUNPOD_API_KEY}",
-        headers={
-            "content-type": "application/json",
-        },
-    )
+    runpod_transport = get_transport(config.runpod_api["URL"], RUNPOD_API_KEY)
 
-    # Setup runpod API
-    runpod = RunPod(runpod_transport)
+    # Setup runpod API, all commands share a single session
+    async with RunPod(runpod_transport) as runpod:
+        if await runpod.test_connection(logger):
+            logger.success("Connected to runpod api")
 
-    if await runpod.test_connection(logger):
-        logger.success("Connected to runpod api")
+            await command(runpod, config, logger)
+        else:
+            logger.error("Failed to connect to runpod")
+            exit(1)
 
-        await command(runpod, config, logger)
-    else:
-        logger.error("Failed to connect to runpod")
-        exit(1)
+def _sniff_subcommand(parser: argparse.ArgumentParser, argv: List[str]) -> Optional[str]:
+    """Returns the first positional token of argv, skipping the values of parser's options"""
+    tokens = iter(argv)
+    for token in tokens:
+        if not token.startswith("-"):
+            return token
+        action = parser._option_string_actions.get(token)
+        if action is not None and action.nargs != 0:
+            # Skip the option's value
+            next(tokens, None)
+    return None
 
-def main():
+
+def build_parser(argv: Optional[List[str]] = None) -> argparse.ArgumentParser:
+    """Builds the command line parser
+
+    When argv names a known command only that command's subparser is built;
+    otherwise (no command, --help, typos) every subparser is built.
+    """
     parser = argparse.ArgumentParser(
         description=f"RunPodPy v{runpodpy.__version__}",
         add_help=True,
@@ -102,212 +303,58 @@ def main():
         required=False,
     )
 
-    stop_parser = command_parsers.add_parser("stop", help="Stop a pod")
-    stop_parser.add_argument(
-        "--podId",
-        type=str,
-        help="Pod id to stop",
-        required=False,
-        default=None,
-    )
-    stop_parser.add_argument(
-        "--all",
-        action="store_true",
-        help="Stop all pods",
-        required=False,
-        default=False,
-    )
+    subcommands = SUBCOMMANDS
+    if argv is not None:
+        selected = SUBCOMMANDS_BY_NAME.get(_sniff_subcommand(parser, argv))
+        if selected is not None:
+            subcommands = (selected,)
 
-    destroy_parser = command_parsers.add_parser(
-        "destroy", help="Destroy a pod", aliases=["terminate"]
-    )
-    destroy_parser.add_argument(
-        "--podId",
-        type=str,
-        help="Pod id to destroy",
-        required=False,
-        default=None,
-    )
-    destroy_parser.add_argument(
-        "--all",
-        action="store_true",
-        help="Destroy all pods",
-        required=False,
-        default=False,
-    )
+    for name, help, aliases, arguments in subcommands:
+        command_parser = command_parsers.add_parser(name, help=help, aliases=aliases)
+        for flags, kwargs in arguments:
+            command_parser.add_argument(*flags, required=False, **kwargs)
 
-    start_parser = command_parsers.add_parser(
-        "start", help="Start a pod", aliases=["run", "resume"]
-    )
-    start_parser.add_argument(
-        "--podId",
-        type=str,
-        help="Pod id to start",
-        required=False,
-        default=None,
-    )
-    start_parser.add_argument(
-        "--all",
-        action="store_true",
-        help="Start all pods",
-        required=False,
-        default=False,
-    )
-    start_parser.add_argument(
-        "--max_bid",
-        type=float,
-        help="Maximum bid for the pod",
-        required=False,
-        default=None,
-    )
-    start_parser.add_argument(
-        "--spot",
-        action="store_true",
-        help="Start the pod as a spot instance",
-        required=False,
-        default=False,
-    )
+    return parser
 
-    create_parser = command_parsers.add_parser("create", help="Create a pod")
-    create_parser.add_argument(
-        "--spot",
-        action="store_true",
-        help="Create the pod as a spot instance",
-        required=False,
-        default=False,
-    )
-    create_parser.add_argument(
-        "--max_bid",
-        type=float,
-        help="Maximum bid for the pod",
-        required=False,
-        default=None,
-    )    
-    create_parser.add_argument(
-        "--podName",
-        "--machine.podName",
-        dest="machine.podName",
-        type=str,
-        help="Pod name to create",
-        required=False,
-        default=None,
-    )
-    create_parser.add_argument(
-        "--gpuTypeId",
-        "--machine.gpuTypeId",
-        dest="machine.gpuTypeId",
-        type=GPUTypeId,
-        choices=list(GPUTypeId),
-        help='The GPU type to use. e.g. "NVIDIA GeForce RTX 3080 Ti"',
-        required=False,
-        default=GPUTypeId.RTX_3080_TI,
-    )
-    create_parser.add_argument(
-        "--cloudType",
-        "--cloud",
-        dest="cloudType",
-        type=CloudType,
-        choices=list(CloudType),
-        help='The CloudType to deploy to. e.g. COMMUNITY, SECURE',
-        required=False,
-        default=CloudType.COMMUNITY,
-    )
-    create_parser.add_argument(
-        "--imageName",
-        "--machine.imageName",
-        dest="machine.imageName",
-        type=str,
-        help="The docker image to use",
-        required=False,
-        default='pytorch/pytorch',
-    )
-    create_parser.add_argument(
-        "--volumePath",
-        "--machine.volumePath",
-        dest="machine.volumePath",
-        type=str,
-        help="The volume path to mount",
-        required=False,
-        default='/root',
-    )
-    create_parser.add_argument(
-        "--args",
-        "--machine.args",
-        dest="machine.args",
-        type=str,
-        help='The arguments to pass to docker. e.g. "bash -c "sleep infinity""',
-        required=False,
-        default='bash -c "sleep infinity"',
-    )
-    create_parser.add_argument(
-        "--containerDiskSize",
-        "--machine.containerDiskSize",
-        dest="machine.containerDiskSize",
-        type=int,
-        help="The size of the container disk (GB)",
-        required=False,
-        default=40,
-    )
-    create_parser.add_argument(
-        "--volumeSize",
-        "--machine.volumeSize",
-        dest="machine.volumeSize",
-        type=int,
-        help="The size of the volume (GB)",
-        required=False,
-        default=40,
-    )
-    create_parser.add_argument(
-        "--gpuCount",
-        "--machine.gpuCount",
-        dest="machine.gpuCount",
-        type=int,
-        help="The number of GPUs to use",
-        required=False,
-        default=1,
-    )
-    create_parser.add_argument(
-        "--templateId",
-        "--machine.templateId",
-        dest="machine.templateId",
-        type=str,
-        help="The templateId to use",
-        required=False,
-        default=argparse.SUPPRESS,
-    )
 
-    list_parser = command_parsers.add_parser("list", help="List pods")
+def run_async(coro):
+    """Runs coro to completion, on uvloop when it is installed, unless RUNPOD_DISABLE_UVLOOP is set"""
+    import asyncio
 
+    if os.environ.get("RUNPOD_DISABLE_UVLOOP"):
+        return asyncio.run(coro)
+
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.run(coro)
+
+    if sys.version_info >= (3, 12):
+        return asyncio.run(coro, loop_factory=uvloop.new_event_loop)
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(coro)
+
+
+def main():
+    parser = build_parser(sys.argv[1:])
     config: Config = config_builder(parser)
 
-    yaml = YAML()
+    # Bail out before touching the config file or importing the API client
+    if config.command not in COMMANDS:
+        parser.print_help()
+        exit(1)
 
     if config.config_file:
         # Load config file into config
-        with open(config.config_file, "r") as config_file:
-            config.update(yaml.load(config_file))
-
-    commands = {
-        "stop": stop,
-        "destroy": destroy,
-        "terminate": destroy,
-        "start": start,
-        "run": start,
-        "resume": start,
-        "create": create,
-        "list": list_pods,
-    }
+        config.update(load_yaml(config.config_file))
 
     configure_logging(config)
 
-    if config.command in commands.keys():
-        # Run main with the command
-        asyncio.run(run_command(config, commands[config.command]))
-    else:
-        parser.print_help()
-        exit(1)
+    from runpodpy import cli
+
+    # Run main with the command
+    run_async(run_command(config, getattr(cli, COMMANDS[config.command])))
 
 
 if __name__ == "__main__":
-    
     main()
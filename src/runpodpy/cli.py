@@ -17,22 +17,32 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import TYPE_CHECKING, List, Tuple
 
-import loguru
-from munch import Munch
 from tabulate import tabulate
 from runpodpy import CloudType, GPUTypeId
+from runpodpy.config import Config
 
-from runpodpy.runpod import OutbidException, RunPod, RunPodException, RunPodInstance
+from runpodpy.runpod import OutbidException, RunPod, RunPodInstance, RunPodTimeoutException
 
+if TYPE_CHECKING:
+    import loguru
+
+# Column headers of the list command's pod table
+POD_TABLE_HEADERS = (
+    "podId",
+    "podName",
+    "cloudType",
+    "instanceType",
+    "gpuTypeId",
+    "gpuCount",
+    "costPerHr",
+    "ip_address",
+)
 
-async def stop(runpod: RunPod, config: Munch, logger: loguru.Logger) -> None:
-    """Stops the instance(s)"""
-    # Check runpod API connection
-    if not await runpod.test_connection(logger):
-        raise RunPodException("Runpod API is not connected")
 
+async def stop(runpod: RunPod, config: Config, logger: loguru.Logger) -> None:
+    """Stops the instance(s)"""
     if config.get("podId") is not None:
         # Stop the pod
         await runpod.stop_instance(config.podId, logger)
@@ -42,20 +52,19 @@ async def stop(runpod: RunPod, config: Munch, logger: loguru.Logger) -> None:
         logger.info("Stopping all pods")
         # Stop all pods
         pods = await runpod.get_pods(logger)
-        for pod in pods:
-            await runpod.stop_instance(pod.podId, logger)
-            logger.info(f"Stopped pod {pod.podId}")
+        results = await runpod.stop_instances([pod.podId for pod in pods], logger)
+        for podId, stopped in results.items():
+            if stopped:
+                logger.info(f"Stopped pod {podId}")
+            else:
+                logger.error(f"Failed to stop pod {podId}")
         logger.info("DONE | Stopped all pods")
     else:
         logger.error("No --podId or --all specified")
 
 
-async def start(runpod: RunPod, config: Munch, logger: loguru.Logger) -> None:
+async def start(runpod: RunPod, config: Config, logger: loguru.Logger) -> None:
     """Starts the instance(s)"""
-    # Check runpod API connection
-    if not await runpod.test_connection(logger):
-        raise RunPodException("Runpod API is not connected")
-
     spot: bool = config.spot
 
     if config.get("podId") is not None:
@@ -73,24 +82,27 @@ async def start(runpod: RunPod, config: Munch, logger: loguru.Logger) -> None:
     elif config.all:
         logger.info("Starting all pods")
         # Get all pods
-        pods = await runpod.get_pods()
-        for pod in pods:
-            # Start the pod
-            await runpod.start_instance(
-                pod.podId, pod.gpuCount, logger, config.max_bid, spot
-            )
-            logger.info(f"Started pod {pod.podId}")
+        pods = await runpod.get_pods(logger)
+
+        results = await runpod.start_instances(
+            [pod.podId for pod in pods],
+            [pod.gpuCount for pod in pods],
+            logger,
+            config.max_bid,
+            spot,
+        )
+        for podId, started in results.items():
+            if started:
+                logger.info(f"Started pod {podId}")
+            else:
+                logger.error(f"Failed to start pod {podId}")
         logger.info("DONE | Started all pods")
     else:
         logger.error("No --podId or --all specified")
 
 
-async def create(runpod: RunPod, config: Munch, logger: loguru.Logger) -> None:
+async def create(runpod: RunPod, config: Config, logger: loguru.Logger) -> None:
     """Creates a runpod instance"""
-    # Check runpod API connection
-    if not await runpod.test_connection(logger):
-        raise RunPodException("Runpod API is not connected")
-
     if config.machine.get("podName") is None:
         # Get all the pods
         pods = await runpod.get_pods(logger)
@@ -120,6 +132,7 @@ async def create(runpod: RunPod, config: Munch, logger: loguru.Logger) -> None:
                 config.machine["gpuTypeId"],
                 config.machine["minVcpuCount"],
                 config.machine["minMemoryInGb"],
+                config.machine.get("args"),
                 logger,
                 cloudType=config.cloudType,
                 spot=config.spot,
@@ -140,7 +153,7 @@ async def create(runpod: RunPod, config: Munch, logger: loguru.Logger) -> None:
                 cloudType=config.cloudType,
                 spot=config.spot,
             )
-    except OutbidException as e:
+    except (OutbidException, RunPodTimeoutException) as e:
         logger.error(e)
         pod = None
         
@@ -152,12 +165,8 @@ async def create(runpod: RunPod, config: Munch, logger: loguru.Logger) -> None:
         logger.info(f"Created {config.cloudType} pod {pod.podId}")
 
 
-async def destroy(runpod: RunPod, config: Munch, logger: loguru.Logger) -> None:
+async def destroy(runpod: RunPod, config: Config, logger: loguru.Logger) -> None:
     """Destroys the instance(s)"""
-    # Check runpod API connection
-    if not await runpod.test_connection(logger):
-        raise RunPodException("Runpod API is not connected")
-
     if config.get("podId") is not None:
         # Destroy the pod
         await runpod.destroy_instance(config.podId, logger)
@@ -167,52 +176,35 @@ async def destroy(runpod: RunPod, config: Munch, logger: loguru.Logger) -> None:
         logger.info("Destroying all pods")
         # Destroy all pods
         pods = await runpod.get_pods(logger)
-        for pod in pods:
-            await runpod.destroy_instance(pod.podId, logger)
-            logger.info(f"Destroyed pod {pod.podId}")
+        results = await runpod.destroy_instances([pod.podId for pod in pods], logger)
+        for podId, destroyed in results.items():
+            if destroyed:
+                logger.info(f"Destroyed pod {podId}")
+            else:
+                logger.error(f"Failed to destroy pod {podId}")
         logger.info("DONE | Destroyed all pods")
     else:
         logger.error("No --podId or --all specified")
 
 
-async def list_pods(runpod: RunPod, config: Munch, logger: loguru.Logger) -> None:
+async def list_pods(runpod: RunPod, config: Config, logger: loguru.Logger) -> None:
     """Lists the instance(s)"""
-    # Check runpod API connection
-    if not await runpod.test_connection(logger):
-        raise RunPodException("Runpod API is not connected")
-
-    logger.info("Connected to RunPod API")
-
     pods = await runpod.get_pods(logger)
 
     if len(pods) == 0:
         logger.info("No pods found")
     else:
-        table: List[List[str]] = [
-            [
-                "podId",
-                "podName",
-                "cloudType",
-                "instanceType",
-                "gpuTypeId",
-                "gpuCount",
-                "costPerHr",
-                "ip_address",
-            ]
+        rows: List[Tuple] = [
+            (
+                pod.podId,
+                pod.podName,
+                pod.cloudType,
+                "SPOT" if pod.spot else "ON_DEMAND",
+                pod.gpuDisplayName,
+                pod.gpuCount,
+                f"${pod.cost:.2f}/hr" if pod.cost is not None else "N/A",
+                pod.ip_address,
+            )
+            for pod in pods
         ]
-        table.extend(
-            [
-                [
-                    pod.podId,
-                    pod.podName,
-                    pod.cloudType,
-                    "SPOT" if pod.spot else "ON_DEMAND",
-                    pod.gpuDisplayName,
-                    pod.gpuCount,
-                    f"${pod.cost:.2f}/hr",
-                    pod.ip_address,
-                ]
-                for pod in pods
-            ]
-        )
-        logger.info(f"Found {len(pods)} pods:\n{tabulate(table, headers='firstrow')}")
+        logger.info(f"Found {len(pods)} pods:\n{tabulate(rows, headers=POD_TABLE_HEADERS, disable_numparse=True)}")
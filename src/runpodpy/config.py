@@ -15,32 +15,92 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER 
 # DEALINGS IN THE SOFTWARE.
 
+import copy
+import functools
+import io
+import os
 from argparse import ArgumentParser
+from enum import Enum
 
-from munch import Munch
-from ruamel.yaml import YAML
+@functools.lru_cache(maxsize=None)
+def _yaml():
+    """ Safe (C-backed when available) loader/dumper for configs, created on first
+    use so ruamel.yaml is only imported once a config is actually loaded or dumped
+    """
+    from ruamel.yaml import YAML
+    from ruamel.yaml.representer import SafeRepresenter
+
+    class ConfigRepresenter( SafeRepresenter ):
+        """ Dumps enum values (e.g. GPUTypeId, CloudType) as their plain value
+        """
+
+    ConfigRepresenter.add_multi_representer( Enum, lambda representer, data: representer.represent_data( data.value ) )
+
+    yaml = YAML( typ = 'safe' )
+    yaml.Representer = ConfigRepresenter
+    yaml.default_flow_style = False
+    return yaml
+
+def load_yaml( path: str ) -> dict:
+    """ Loads the yaml file at path using the shared safe loader, e.g. ~/.runpodpy/config.yaml
+    """
+    with open( os.path.expanduser( path ), "r" ) as yaml_file:
+        return _yaml().load( yaml_file )
 
-yaml = YAML()
+def _dump( items: dict ) -> str:
+    stream = io.StringIO()
+    _yaml().dump( items, stream )
+    return stream.getvalue()
 
-class Config ( Munch ):
+class Config ( dict ):
     """
     Implementation of the config class
+    A dict whose keys can also be read and written as attributes, e.g. config.machine.podName
     """
     def __init__(self, loaded_config = None ):
         super().__init__()
         if loaded_config:
             raise NotImplementedError('Function load_from_relative_path is not fully implemented.')
 
+    def __getattr__(self, key):
+        # Only called when normal attribute lookup fails, so dict methods take precedence
+        try:
+            return self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __setattr__(self, key, value):
+        self[key] = value
+
+    def __delattr__(self, key):
+        try:
+            del self[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def toDict(self) -> dict:
+        """ Get a plain (nested) dict copy of the config
+        """
+        return { key: val.toDict() if isinstance(val, Config) else val for key, val in self.items() }
+
     def __repr__(self) -> str:
         return self.__str__()
     
     def __str__(self) -> str:
-        return "\n" + yaml.dump(self.toDict())
+        items = self.toDict()
+        # Reuse the last dump while the config is unchanged, comparing the plain
+        # dicts is much cheaper than serializing them again. The snapshot is a deep
+        # copy, toDict() keeps plain dicts and lists (e.g. from the yaml) by reference
+        cached = self.__dict__.get('_str_cache')
+        if cached is None or cached[0] != items:
+            cached = ( copy.deepcopy( items ), "\n" + _dump( items ) )
+            self.__dict__['_str_cache'] = cached
+        return cached[1]
 
     def to_string(self, items) -> str:
         """ Get string from items
         """
-        return "\n" + yaml.dump(items.toDict())
+        return "\n" + _dump(items.toDict())
 
     def update_with_kwargs( self, kwargs ):
         """ Add config to self
@@ -66,24 +126,20 @@ def config_builder( parser: ArgumentParser = None, strict: bool = False ) -> Con
         if parser == None:
             parser = ArgumentParser()
        
-        params = parser.parse_known_args()[0]
+        # A single parse; strict rejects unknown arguments instead of ignoring them
+        params = parser.parse_args() if strict else parser.parse_known_args()[0]
         
         _config = Config()
 
-        # Splits params on dot syntax i.e machine.podName          
-        for arg_key, arg_val in params.__dict__.items():
-            split_keys = arg_key.split('.')
+        # Splits params on dot syntax i.e machine.podName
+        for arg_key, arg_val in vars(params).items():
+            *parents, key = arg_key.split('.')
             head = _config
-            keys = split_keys
-            while len(keys) > 1:
-                if hasattr(head, keys[0]):
-                    head = getattr(head, keys[0])  
-                    keys = keys[1:]   
-                else:
-                    head[keys[0]] = Config()
-                    head = head[keys[0]] 
-                    keys = keys[1:]
-            if len(keys) == 1:
-                head[keys[0]] = arg_val
+            for parent in parents:
+                child = head.get(parent)
+                if not isinstance(child, Config):
+                    child = head[parent] = Config()
+                head = child
+            head[key] = arg_val
 
         return _config
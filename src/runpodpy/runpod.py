@@ -18,16 +18,205 @@
 from __future__ import annotations
 
 import asyncio
-import json
-from typing import Dict, List, Optional
+import functools
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, Dict, List, Mapping, NamedTuple, Optional, Tuple, Union
 
-import loguru
 from gql import Client, gql
+from gql.client import AsyncClientSession
 from gql.transport.aiohttp import AIOHTTPTransport
 from gql.transport.exceptions import TransportQueryError, TransportServerError
+from graphql import DocumentNode, ExecutionResult, print_ast
 
 from runpodpy import CloudType, GPUTypeId, PodStatus
 
+if TYPE_CHECKING:
+    # Only needed for annotations; the caller supplies the logger
+    import loguru
+
+# Maximum number of aliased operations sent in a single batched request
+MAX_BATCH_SIZE = 25
+
+# Polling of a newly created pod: the delay grows from the initial delay up to the max delay
+POD_POLL_INITIAL_DELAY = 0.25
+POD_POLL_MAX_DELAY = 3.0
+# Seconds to wait for a newly created pod to show up before giving up
+POD_START_TIMEOUT = 120.0
+
+
+@functools.lru_cache(maxsize=None)
+def _batch_document(
+    operation: str, field: str, variableType: str, argument: str, selection: str, count: int
+) -> DocumentNode:
+    """
+    Builds a document selecting field once per alias p0...p{count - 1}, each with its own variable.
+    e.g. mutation($p0: String!, $p1: String!) { p0: podStop(input: {podId: $p0}) {...} p1: ... }
+
+    :param argument: the field arguments, with %s in place of the variable
+    """
+    variables = ", ".join(f"$p{i}: {variableType}" for i in range(count))
+    fields = "\n".join(
+        f"p{i}: {field}({argument % f'$p{i}'}) {selection}" for i in range(count)
+    )
+
+    return gql(f"{operation}({variables}) {{\n{fields}\n}}")
+
+
+# Documents are parsed once at import and reused for every call
+
+_PRICES_QUERY = gql(
+    """query GpuTypes ($id: String!, $gpuCount: Int!) {
+        gpuTypes(input: {id: $id}) {
+            secureCloud
+            communityCloud
+            lowestPrice(input: {gpuCount: $gpuCount}) {
+                minimumBidPrice
+                uninterruptablePrice
+            }
+        }
+    }"""
+)
+
+# The same selection for batched documents, formatted with the gpuCount
+_PRICES_SELECTION = """{
+    secureCloud
+    communityCloud
+    lowestPrice(input: {gpuCount: %d}) {
+        minimumBidPrice
+        uninterruptablePrice
+    }
+}"""
+
+_GPU_TYPES_QUERY = gql(
+    """query GpuTypes {
+        gpuTypes {
+            id
+            memoryInGb
+            secureCloud
+            communityCloud
+            lowestPrice(input: {gpuCount: 1}) {
+                minimumBidPrice
+                uninterruptablePrice
+            }
+        }
+    }"""
+)
+
+# Selection of a pod, as consumed by _pod_from_data
+_POD_SELECTION = """{
+    id
+    podType
+    costPerHr
+    name
+    gpuCount
+    vcpuCount
+    memoryInGb
+    imageName
+    desiredStatus
+    machine {
+        podHostId
+        gpuDisplayName
+        secureCloud
+    }
+}"""
+
+_POD_BY_ID_QUERY = gql(
+    f"""query myPods($podId: String!) {{
+        pod (input: {{podId: $podId}}) {_POD_SELECTION}
+    }}"""
+)
+
+_PODS_QUERY = gql(
+    f"""query myPods {{
+        myself {{
+            pods {_POD_SELECTION}
+        }}
+    }}"""
+)
+
+_TEST_CONNECTION_QUERY = gql(
+    """query myPods {
+        myself {
+            id
+        }
+    }"""
+)
+
+_STOP_POD_MUTATION = gql(
+    """mutation($podId: String!) {
+        podStop(input: {podId: $podId}) {
+            desiredStatus
+        }
+    }"""
+)
+
+_TERMINATE_POD_MUTATION = gql(
+    """mutation terminatePod($input: PodTerminateInput!) {
+        podTerminate(input: $input)
+    }"""
+)
+
+_RENT_INTERRUPTABLE_MUTATION = gql(
+    """mutation($input: PodRentInterruptableInput!) {
+        podRentInterruptable(input: $input) {
+            id
+            imageName
+            podType
+            costPerHr
+            gpuCount
+            vcpuCount
+            memoryInGb
+            desiredStatus
+            machine {
+                podHostId
+            }
+        }
+    }"""
+)
+
+_DEPLOY_ON_DEMAND_MUTATION = gql(
+    """mutation($input: PodFindAndDeployOnDemandInput!) {
+        podFindAndDeployOnDemand(input: $input) {
+            id
+            imageName
+            podType
+            costPerHr
+            gpuCount
+            vcpuCount
+            memoryInGb
+            desiredStatus
+            machine {
+                podHostId
+            }
+        }
+    }"""
+)
+
+_BID_RESUME_POD_MUTATION = gql(
+    """mutation($podId: String!, $maxBid: Float!, $gpuCount: Int!) {
+        podBidResume(input: {podId: $podId, bidPerGpu: $maxBid, gpuCount: $gpuCount}) {
+            desiredStatus
+        }
+    }"""
+)
+
+_RESUME_POD_MUTATION = gql(
+    """mutation($podId: String!, $gpuCount: Int!) {
+        podResume(input: {podId: $podId, gpuCount: $gpuCount}) {
+            desiredStatus
+        }
+    }"""
+)
+
+# The error message of resuming a pod that is already running
+_POD_NOT_EXITED_MESSAGE = "Cannot resume a pod that is not in exited state"
+
+# The resume mutation and its result field, by whether the pod is started as a spot instance
+_RESUME_OPERATIONS: Dict[bool, Tuple[DocumentNode, str]] = {
+    True: (_BID_RESUME_POD_MUTATION, "podBidResume"),
+    False: (_RESUME_POD_MUTATION, "podResume"),
+}
+
 
 class RunPodException(Exception):
     """RunPodException"""
@@ -43,17 +232,64 @@ class OutbidException(RunPodException):
     pass
 
 
+class RunPodTimeoutException(RunPodException):
+    """RunPodTimeoutException
+    Raised when a newly created pod does not show up within the timeout.
+    """
+
+    pass
+
+
+def _is_outbid(errors: Optional[List[Dict[str, Any]]]) -> bool:
+    """Whether the first GraphQL error says the bid was too low, by its code or else its message"""
+    if not errors:
+        return False
+    error = errors[0]
+    return (error.get("extensions") or {}).get("code") == "OUTBID" or "outbid" in error.get("message", "")
+
+
+class GPUTypeInfo(NamedTuple):
+    """A gpu type and its attributes, as returned by RunPod.get_gpu_types"""
+
+    gpuTypeId: GPUTypeId
+    memoryInGb: Optional[int]
+    secureCloud: bool
+    communityCloud: bool
+    # The current spot price (per GPU)
+    minimumBidPrice: Optional[float]
+    # The current on-demand price (per GPU)
+    uninterruptablePrice: Optional[float]
+
+
 class RunPodInstance:
     """RunPodInstance"""
 
-    ip_address: str = "ssh.runpod.io"
+    # Slots instead of a per-instance __dict__, get_pods builds one instance per pod
+    __slots__ = (
+        "podName",
+        "cost",
+        "spot",
+        "podId",
+        "podHostId",
+        "gpuCount",
+        "gpuDisplayName",
+        "vcpuCount",
+        "memoryInGb",
+        "cloudType",
+        "imageName",
+        "desiredStatus",
+        "ip_address",
+    )
+
+    ip_address: str
     gpuCount: int
     gpuDisplayName: GPUTypeId
     vcpuCount: int
     memoryInGb: int
     imageName: str
     podName: str
-    cost: float
+    # None if the API has no cost for the pod
+    cost: Optional[float]
     podId: str
     podHostId: str
     spot: bool
@@ -63,7 +299,7 @@ class RunPodInstance:
     def __init__(
         self,
         podName: str,
-        cost: float,
+        cost: Optional[float],
         podId: str,
         podHostId: str,
         imageName: str,
@@ -87,571 +323,557 @@ class RunPodInstance:
         self.cloudType = cloudType
         self.imageName = imageName
         self.desiredStatus = desiredStatus
+        # A slot can't have a class level default, so it is set per instance
+        self.ip_address = "ssh.runpod.io"
 
     def __str__(self):
-        return f"{self.podId} - {self.gpuDisplayName} - ${self.cost:0.2f}/hr - {self.cloudType.value}:{'SPOT' if self.spot else 'ON-DEMAND'}:{self.desiredStatus.value}"
+        cost = f"${self.cost:0.2f}/hr" if self.cost is not None else "N/A"
+        return f"{self.podId} - {self.gpuDisplayName} - {cost} - {self.cloudType.value}:{'SPOT' if self.spot else 'ON-DEMAND'}:{self.desiredStatus.value}"
 
     async def stop_instance(self, runpod: "RunPod", logger: loguru.Logger) -> bool:
-        """Stops the instance"""
-        await runpod.stop_instance(self.podId, logger)
+        """Stops the instance, returns whether it was stopped"""
+        return await runpod.stop_instance(self.podId, logger)
 
     async def destroy_instance(self, runpod: "RunPod", logger: loguru.Logger) -> bool:
-        """Destroys the instance"""
-        await runpod.destroy_instance(self.podId, logger)
+        """Destroys the instance, returns whether it was destroyed"""
+        return await runpod.destroy_instance(self.podId, logger)
 
     async def start_instance(
         self, runpod: "RunPod", logger: loguru.Logger, max_bid: Optional[float] = None
     ) -> bool:
-        """Starts the instance"""
-        await runpod.start_instance(
+        """Starts the instance, returns whether it was started (or was already running)"""
+        return await runpod.start_instance(
             self.podId, self.gpuCount, logger, max_bid, self.spot
         )
 
 
+# Pod statuses by name: a plain mapping lookup, where PodStatus[name] is a call into EnumMeta.__getitem__
+_POD_STATUSES: Mapping[str, PodStatus] = PodStatus.__members__
+
+
+def _document_source(document: DocumentNode) -> str:
+    """Gets the GraphQL source of a document, for logging it"""
+    if document.loc is not None:
+        return document.loc.source.body
+    return print_ast(document)
+
+
+def _pod_from_data(pod_data: Dict[str, Any]) -> RunPodInstance:
+    """Builds a RunPodInstance from a pod selected with _POD_SELECTION"""
+    machine: Dict[str, Any] = pod_data["machine"]
+    cost = pod_data.get("costPerHr")
+
+    return RunPodInstance(
+        podName=pod_data["name"],
+        cost=float(cost) if cost is not None else None,
+        podId=pod_data["id"],
+        podHostId=machine["podHostId"],
+        # Not a typo, enum has a spelling issue in API
+        spot=pod_data["podType"] == "INTERRUPTABLE",
+        gpuDisplayName=GPUTypeId.lookup_gpuDisplayName(machine["gpuDisplayName"]),
+        gpuCount=pod_data["gpuCount"],
+        vcpuCount=int(pod_data["vcpuCount"]),
+        memoryInGb=int(pod_data["memoryInGb"]),
+        imageName=pod_data["imageName"],
+        cloudType=CloudType.SECURE if machine["secureCloud"] else CloudType.COMMUNITY,
+        desiredStatus=_POD_STATUSES[pod_data["desiredStatus"]],
+    )
+
+
+def _prices_from_data(types_data: List[Dict[str, Any]]) -> Tuple[Optional[float], Optional[float]]:
+    """Gets the (bid, on-demand price) from gpu types selected with _PRICES_QUERY"""
+    if not types_data:
+        return None, None
+
+    type_data = types_data[0]
+    bid: Optional[float] = None
+    if type_data["communityCloud"] and type_data["lowestPrice"]["minimumBidPrice"] is not None:
+        bid = float(type_data["lowestPrice"]["minimumBidPrice"])
+
+    price: Optional[float] = None
+    if type_data["secureCloud"] and type_data["lowestPrice"]["uninterruptablePrice"] is not None:
+        price = float(type_data["lowestPrice"]["uninterruptablePrice"])
+
+    return bid, price
+
+
+def _invalidates_pod_cache(method: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Clears the RunPod's cached pod lookups once the decorated (mutating) method is done"""
+
+    @functools.wraps(method)
+    async def wrapper(self: "RunPod", *args, **kwargs) -> Any:
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            self._invalidate_pod_cache()
+
+    return wrapper
+
+
+class _PodWaiter:
+    """
+    Waits for newly created pods to show up. All pods waited on through one RunPod
+    are polled together, in one batched get_pods_by_ids query per round.
+    Each pod backs off on its own, so a pod added late is still polled soon after it is added.
+    """
+
+    def __init__(self, runpod: "RunPod"):
+        self._runpod = runpod
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        # When each pending pod is next due to be polled, and the delay after that poll
+        self._schedule: Dict[str, Tuple[float, float]] = {}
+        # Set when a pod is added, to wake the poll early
+        self._added: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def wait(self, podId: str, logger: loguru.Logger) -> RunPodInstance:
+        """Waits until the pod shows up, cancel the wait to stop waiting for the pod"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(podId, []).append(future)
+        if podId not in self._schedule:
+            self._schedule[podId] = (loop.time(), POD_POLL_INITIAL_DELAY)
+
+        if self._task is None or self._task.done():
+            self._added = asyncio.Event()
+            self._task = asyncio.ensure_future(self._poll(logger))
+        else:
+            self._added.set()
+
+        return await future
+
+    def cancel(self) -> None:
+        """Stops polling, cancelling every pending wait"""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for futures in self._pending.values():
+            for future in futures:
+                future.cancel()
+        self._pending.clear()
+        self._schedule.clear()
+
+    def _discard_done(self) -> None:
+        """Forgets the waits that were cancelled (e.g. timed out)"""
+        for podId in list(self._pending):
+            futures = [future for future in self._pending[podId] if not future.done()]
+            if futures:
+                self._pending[podId] = futures
+            else:
+                del self._pending[podId]
+                del self._schedule[podId]
+
+    async def _poll(self, logger: loguru.Logger) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._discard_done()
+            if not self._pending:
+                return
+
+            now = loop.time()
+            due = [podId for podId, (at, _) in self._schedule.items() if at <= now]
+            if not due:
+                # Sleep until the next pod is due, or a new pod is added
+                self._added.clear()
+                next_at = min(at for at, _ in self._schedule.values())
+                try:
+                    await asyncio.wait_for(self._added.wait(), next_at - now)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                pods = await self._runpod.get_pods_by_ids(due, logger)
+            except Exception as e:
+                for futures in self._pending.values():
+                    for future in futures:
+                        if not future.done():
+                            future.set_exception(e)
+                self._pending.clear()
+                self._schedule.clear()
+                return
+
+            now = loop.time()
+            for podId, pod in pods.items():
+                if pod is not None:
+                    del self._schedule[podId]
+                    for future in self._pending.pop(podId, []):
+                        if not future.done():
+                            future.set_result(pod)
+                else:
+                    # Not up yet, wait for the pod to finish start
+                    _, delay = self._schedule[podId]
+                    self._schedule[podId] = (now + delay, min(delay * 2, POD_POLL_MAX_DELAY))
+
+
 class RunPod:
-    """RunPod class"""
+    """RunPod class
+
+    All API calls share one client session, opened on first use. Use the instance as an
+    async context manager (``async with RunPod(transport) as runpod:``), or call close()
+    when done, so the session and its connections are released.
+
+    For lower per-call overhead, opt in to a faster event loop with install_fast_loop().
+
+    Concurrent get_pod_by_id calls for the same pod (and concurrent get_pods calls) share
+    a single request, as do concurrent stop_instance/start_instance calls for a pod.
+    With pod_cache_ttl > 0 the pod lookups are also reused for that many seconds, and with
+    price_cache_ttl > 0 so are the prices and gpu types (unless called with refresh=True);
+    any stop/start/destroy/create made through this instance clears the cache.
+    """
 
     gql_transport: AIOHTTPTransport = None
 
-    def __init__(self, gql_transport: AIOHTTPTransport):
+    def __init__(
+        self, gql_transport: AIOHTTPTransport, pod_cache_ttl: float = 0.0, price_cache_ttl: float = 0.0
+    ):
         self.gql_transport = gql_transport
+        self.pod_cache_ttl = pod_cache_ttl
+        self.price_cache_ttl = price_cache_ttl
+        # Results of the cached lookups, as (expiry, result), see __lookup
+        self._cache: Dict[Tuple, Tuple[float, Any]] = {}
+        # Calls being made, shared with concurrent identical calls, see __share
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+        # Bumped by every invalidation, so lookups started before it are not cached
+        self._pod_cache_generation: int = 0
+        self._client: Optional[Client] = None
+        self._session: Optional[AsyncClientSession] = None
+        self._session_lock: Optional[asyncio.Lock] = None
+        # Set once test_connection succeeds on the current session
+        self._connected: bool = False
+        self._pod_waiter = _PodWaiter(self)
+
+    @staticmethod
+    def install_fast_loop() -> None:
+        """
+        Opt-in event loop speedups, both skipped when unavailable:
+        uvloop is used for event loops created afterwards (call before asyncio.run()),
+        and when called inside a running loop, tasks of that loop start eagerly (Python 3.12+)
+        """
+        try:
+            import uvloop
+        except ImportError:
+            pass
+        else:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if hasattr(asyncio, "eager_task_factory"):
+            loop.set_task_factory(asyncio.eager_task_factory)
 
-    async def get_on_demand_price(self, gpuTypeId: GPUTypeId, logger: loguru.Logger, gpuCount: int = 1) -> Optional[float]:
+    async def _get_session(self) -> AsyncClientSession:
         """
-        Gets the current on-demand price for the gpuTypeId
+        Gets the client session shared by all API calls, connecting the transport on first use.
+        Sharing one session lets concurrent calls reuse the same connection pool.
+        """
+        if self._session is None:
+            if self._session_lock is None:
+                self._session_lock = asyncio.Lock()
+            async with self._session_lock:
+                if self._session is None:
+                    # No schema: gql would then validate every document on every execute
+                    self._client = Client(transport=self.gql_transport)
+                    self._session = await self._client.__aenter__()
+
+        return self._session
+
+    async def _execute_result(
+        self, document: DocumentNode, variable_values: Optional[Dict[str, Any]] = None
+    ) -> ExecutionResult:
+        """
+        Executes the document, returning the ExecutionResult with its errors instead of raising them,
+        for the calls where errors are expected (e.g. polling a pod that does not exist yet).
+        Without a schema session.execute runs just the transport's execute (with the timeout),
+        then raises a TransportQueryError for any errors in the result
+        """
+        session = await self._get_session()
+        return await asyncio.wait_for(
+            session.transport.execute(document, variable_values=variable_values),
+            self._client.execute_timeout,
+        )
+
+    async def close(self) -> None:
+        """Closes the shared client session, if open"""
+        self._pod_waiter.cancel()
+        if self._session is not None:
+            await self._client.__aexit__(None, None, None)
+            self._client = None
+            self._session = None
+        # A new session is re-checked on its first test_connection
+        self._connected = False
+
+    def _invalidate_pod_cache(self) -> None:
+        """Forgets cached lookups, e.g. after a pod was changed"""
+        self._cache.clear()
+        self._pod_cache_generation += 1
+
+    async def __lookup(
+        self, key: Tuple, ttl: float, fetch: Callable[[], Awaitable[Any]], refresh: bool = False
+    ) -> Any:
+        """
+        Runs fetch for key, sharing one in-flight call between concurrent callers,
+        and reusing its result for ttl seconds (unless refresh)
+        """
+        if not refresh:
+            cached = self._cache.get(key)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+
+        # Keyed by the generation too, so a call made after an invalidation does not join
+        # a fetch started before it (which may return the state from before the change)
+        generation = self._pod_cache_generation
+        return await self.__share(
+            ("lookup", generation) + key, lambda: self.__fetch(key, ttl, fetch, generation)
+        )
+
+    async def __fetch(
+        self, key: Tuple, ttl: float, fetch: Callable[[], Awaitable[Any]], generation: int
+    ) -> Any:
+        result = await fetch()
+        if ttl > 0 and generation == self._pod_cache_generation:
+            self._cache[key] = (time.monotonic() + ttl, result)
+        return result
+
+    async def __share(self, key: Tuple, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Runs call, or if a call with the same key is in flight, waits for that one's result"""
+        shared = self._in_flight.get(key)
+        if shared is None:
+            shared = asyncio.ensure_future(call())
+            self._in_flight[key] = shared
+            shared.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        # Shielded, a cancelled caller does not cancel the call the others are waiting on
+        return await asyncio.shield(shared)
+
+    async def __aenter__(self) -> "RunPod":
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def get_prices(
+        self, gpuTypeId: GPUTypeId, logger: loguru.Logger, gpuCount: int = 1, refresh: bool = False
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """
+        Gets both the current spot and on-demand price for the gpuTypeId, in one request.
+        Concurrent calls for the same gpuTypeId and gpuCount share that request
 
         :param gpuTypeId: the gpu type id to check
         :param logger: the logger to use
         :param gpuCount: the number of gpus to check (defaults to 1)
-        :return: the current on-demand price or None if no price is available
+        :param refresh: whether to skip the prices cached for price_cache_ttl
+        :return: a tuple of the current bid and on-demand price, each None if it is not available
         """
         try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
-                params = {
-                    "id": gpuTypeId.value,
-                    "gpuCount": gpuCount,
-                }
-
-                query = gql(
-                    """query GpuTypes ($id: String!, $gpuCount: Int!) {
-                            gpuTypes(input: {id: $id}) {
-                                secureCloud
-                                lowestPrice(input: {gpuCount: $gpuCount}) {
-                                    uninterruptablePrice
-                                }
-                            }
-                    }"""
-                )
+            return await self.__lookup(
+                ("prices", gpuTypeId, gpuCount),
+                self.price_cache_ttl,
+                lambda: self.__get_prices(gpuTypeId, gpuCount),
+                refresh,
+            )
+        except (TransportServerError, TransportQueryError) as e:
+            # Caught out of the lookup, so a failure is not cached as "no price"
+            logger.exception(e)
+            return None, None
 
-                data = await session.execute(query, variable_values=params)
-                type_data: Dict[str, str] = data["gpuTypes"][0]
+    async def __get_prices(
+        self, gpuTypeId: GPUTypeId, gpuCount: int
+    ) -> Tuple[Optional[float], Optional[float]]:
+        session = await self._get_session()
+        params = {
+            "id": gpuTypeId.value,
+            "gpuCount": gpuCount,
+        }
 
-                if type_data["secureCloud"] and type_data["lowestPrice"]["uninterruptablePrice"] is not None:
-                    return float(type_data["lowestPrice"]["uninterruptablePrice"])
+        query = _PRICES_QUERY
 
-                return None
+        data = await session.execute(query, variable_values=params)
+        types_data: List[Dict[str, Any]] = data["gpuTypes"]
 
-        except (TransportServerError, TransportQueryError) as e:
-            logger.exception(e)
-            return None
+        return _prices_from_data(types_data)
 
-    async def get_current_bid(self, gpuTypeId: GPUTypeId, logger: loguru.Logger, gpuCount: int = 1) -> Optional[float]:
+    async def get_prices_bulk(
+        self, gpuTypeIds: List[GPUTypeId], logger: loguru.Logger, gpuCount: int = 1
+    ) -> Dict[GPUTypeId, Tuple[Optional[float], Optional[float]]]:
         """
-        Gets the current spot price for the gpuTypeId
+        Gets the current spot and on-demand prices of many gpu types, batching the queries into as few requests as possible
 
-        :param gpuTypeId: thhe gpu type id to check
+        :param gpuTypeIds: the gpu type ids to check
         :param logger: the logger to use
         :param gpuCount: the number of gpus to check (defaults to 1)
-        :return: the current bid or None if no bid is available
+        :return: a dict mapping each gpuTypeId to a tuple of its current bid and on-demand price,
+            each None if it is not available
         """
-        try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
-                params = {
-                    "id": gpuTypeId.value,
-                    "gpuCount": gpuCount,
-                }
+        results = await self.__execute_batched(
+            "query",
+            "gpuTypes",
+            "String!",
+            "input: {id: %s}",
+            _PRICES_SELECTION % int(gpuCount),
+            [gpuTypeId.value for gpuTypeId in gpuTypeIds],
+            logger,
+        )
 
-                query = gql(
-                    """query GpuTypes ($id: String!, $gpuCount: Int!) {
-                            gpuTypes(input: {id: $id}) {
-                                communityCloud
-                                lowestPrice(input: {gpuCount: $gpuCount}) {
-                                    minimumBidPrice
-                                }
-                            }
-                    }"""
-                )
+        return {
+            gpuTypeId: _prices_from_data(data) if ok else (None, None)
+            for gpuTypeId, (ok, data) in zip(gpuTypeIds, results)
+        }
 
-                data = await session.execute(query, variable_values=params)
-                type_data: Dict[str, str] = data["gpuTypes"][0]
+    async def get_on_demand_price(self, gpuTypeId: GPUTypeId, logger: loguru.Logger, gpuCount: int = 1, refresh: bool = False) -> Optional[float]:
+        """
+        Gets the current on-demand price for the gpuTypeId
 
-                if type_data["communityCloud"] and type_data["lowestPrice"]["minimumBidPrice"] is not None:
-                    return float(type_data["lowestPrice"]["minimumBidPrice"])
+        :param gpuTypeId: the gpu type id to check
+        :param logger: the logger to use
+        :param gpuCount: the number of gpus to check (defaults to 1)
+        :param refresh: whether to skip the prices cached for price_cache_ttl
+        :return: the current on-demand price or None if no price is available
+        """
+        _, price = await self.get_prices(gpuTypeId, logger, gpuCount, refresh)
+        return price
 
-                return None
+    async def get_current_bid(self, gpuTypeId: GPUTypeId, logger: loguru.Logger, gpuCount: int = 1, refresh: bool = False) -> Optional[float]:
+        """
+        Gets the current spot price for the gpuTypeId
 
-        except (TransportServerError, TransportQueryError) as e:
-            logger.exception(e)
-            return None
+        :param gpuTypeId: thhe gpu type id to check
+        :param logger: the logger to use
+        :param gpuCount: the number of gpus to check (defaults to 1)
+        :param refresh: whether to skip the prices cached for price_cache_ttl
+        :return: the current bid or None if no bid is available
+        """
+        bid, _ = await self.get_prices(gpuTypeId, logger, gpuCount, refresh)
+        return bid
 
-    async def get_gpu_types(self, logger: loguru.Logger) -> List[Tuple[GPUTypeId, Optional[int], bool, bool, Optional[float], Optional[float]]]:
+    async def get_gpu_types(
+        self, logger: loguru.Logger, refresh: bool = False
+    ) -> List[GPUTypeInfo]:
         """
         Gets the gpu types and their attributes
 
         :param logger: the logger to use
-        :return: a list of tuples containing the gpu_type_id, memoryInGb, secureCloud, communityCloud, minimum bid price, on-demand price
+        :param refresh: whether to skip the gpu types cached for price_cache_ttl
+        :return: a GPUTypeInfo for each (known) gpu type
         """
         try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
-                query = gql(
-                    """query GpuTypes {
-                        gpuTypes {
-                            id
-                            memoryInGb
-                            secureCloud
-                            communityCloud
-                            lowestPrice(input: {gpuCount: 1}) {
-                                minimumBidPrice
-                                uninterruptablePrice
-                            }
-                        }
-                    }"""
-                )
-
-                data = await session.execute(query)
-                types_data: List[Dict[str, Any]] = data["gpuTypes"]
-
+            gpu_types = await self.__lookup(
+                ("gpuTypes",), self.price_cache_ttl, lambda: self.__get_gpu_types(logger), refresh
+            )
         except (TransportServerError, TransportQueryError) as e:
+            # Caught out of the lookup, so a failure is not cached as "no gpu types"
             logger.exception(e)
             return []
 
-        gpu_types: List[Tuple[GPUTypeId, Optional[int], bool, bool, Optional[float], Optional[float]]] = []
-        for gpuInfo in types_data:
-            try:
-                gpu_types.append(
-                    (
-                        GPUTypeId(gpuInfo["id"]),
-                        gpuInfo["memoryInGb"],
-                        gpuInfo["secureCloud"],
-                        gpuInfo["communityCloud"],
-                        gpuInfo["lowestPrice"]["minimumBidPrice"],
-                        gpuInfo["lowestPrice"]["uninterruptablePrice"],
-                    )
-                )
-            except KeyError:
-                logger.exception(f"Error parsing GPU type: {gpuInfo}")
-                continue
-
-
+        # A copy, so callers can't modify the shared (cached) list
+        return list(gpu_types)
 
-        return gpu_types
+    async def __get_gpu_types(
+        self, logger: loguru.Logger
+    ) -> List[GPUTypeInfo]:
+        session = await self._get_session()
+        query = _GPU_TYPES_QUERY
 
-    async def __create_spot_instance(
-        self,
-        max_bid: float,
-        podName: str,
-        imageName: str,
-        containerDiskSize: int,
-        volumeSize: int,
-        volumePath: str,
-        gpuCount: int,
-        gpuTypeId: GPUTypeId,
-        minVcpuCount: int,
-        minMemoryInGb: int,
-        args: str,
-        logger: loguru.Logger,
-        cloudType: CloudType = CloudType.COMMUNITY,
-    ) -> RunPodInstance:
-        """Creates a new spot instance using the API"""
+        data = await session.execute(query)
+        types_data: List[Dict[str, Any]] = data["gpuTypes"]
 
-        try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
-                params = {
-                    "podName": podName,
-                    "imageName": imageName,
-                    "containerDiskSize": containerDiskSize,
-                    "volumeSize": volumeSize,
-                    "volumePath": volumePath,
-                    "gpuCount": gpuCount,
-                    "gpuTypeId": gpuTypeId.value,
-                    "args": args,
-                    "max_bid": max_bid,
-                    "minVcpuCount": minVcpuCount,
-                    "minMemoryInGb": minMemoryInGb,
-                    "cloudType": cloudType.value,
-                }
-
-                query = gql(
-                    """mutation {{
-                                podRentInterruptable(
-                                    input: {{
-                                        bidPerGpu: {max_bid},
-                                        cloudType: {cloudType},
-                                        gpuCount: {gpuCount},
-                                        volumeInGb: {volumeSize},
-                                        containerDiskInGb: {containerDiskSize},
-                                        minVcpuCount: {minVcpuCount},
-                                        minMemoryInGb: {minMemoryInGb},
-                                        gpuTypeId: "{gpuTypeId}",
-                                        name: "{podName}",
-                                        
-                                        dockerArgs: {args},
-                                        volumeMountPath: "{volumePath}",
-                                        imageName: "{imageName}",
-
-                                        templateId: "{templateId}",
-                                    }}
-                                ) {{
-                                    id
-                                    imageName
-                                    podType
-                                    machineId
-                                    costPerHr
-                                    gpuCount
-                                    vcpuCount
-                                    memoryInGb
-                                    desiredStatus
-                                    machine {{
-                                        podHostId
-                                        gpuDisplayName
-                                    }}
-                                }}
-                            }}""".format(
-                        **params
-                    )
-                )
+        gpu_types: List[GPUTypeInfo] = []
+        for gpuInfo in types_data:
+            # One dict lookup each, GPU types unknown to GPUTypeId (e.g. newly added ones) are skipped
+            gpuTypeId = GPUTypeId.lookup_gpuDisplayName(gpuInfo.get("id"))
+            lowestPrice: Optional[Dict[str, Any]] = gpuInfo.get("lowestPrice")
+            if gpuTypeId is None or lowestPrice is None:
+                logger.warning(f"Skipping GPU type: {gpuInfo}")
+                continue
 
-                data = await session.execute(query)
-                pod_data: Dict[str, str] = data["podRentInterruptable"]
-
-                pod: RunPodInstance = RunPodInstance(
-                    podName=params["podName"],
-                    cost=float(pod_data["costPerHr"]),
-                    podId=pod_data["id"],
-                    podHostId=pod_data["machine"]["podHostId"],
-                    spot=pod_data["podType"] == "INTERRUPTABLE",
-                    gpuDisplayName=gpuTypeId,
-                    gpuCount=int(pod_data["gpuCount"]),
-                    vcpuCount=int(pod_data["vcpuCount"]),
-                    memoryInGb=int(pod_data["memoryInGb"]),
-                    cloudType=cloudType,
-                    imageName=imageName,
-                    desiredStatus=PodStatus[pod_data["desiredStatus"]],
+            gpu_types.append(
+                GPUTypeInfo(
+                    gpuTypeId,
+                    gpuInfo.get("memoryInGb"),
+                    gpuInfo.get("secureCloud"),
+                    gpuInfo.get("communityCloud"),
+                    lowestPrice.get("minimumBidPrice"),
+                    lowestPrice.get("uninterruptablePrice"),
                 )
+            )
 
-                return pod
-
-        except (TransportServerError, TransportQueryError) as e:
-            if "outbid" in e.errors[0]["message"]:
-                raise OutbidException(e.errors[0]["message"])
-            else:
-                logger.exception(e)
-            return None
+        return gpu_types
 
-    async def __create_spot_instance_from_template_id(
+    async def __create_instance(
         self,
-        max_bid: float,
-        podName: str,
-        templateId: str,
-        containerDiskSize: int,
-        volumeSize: int,
-        gpuCount: int,
+        params: Dict[str, Any],
         gpuTypeId: GPUTypeId,
-        minVcpuCount: int,
-        minMemoryInGb: int,
         logger: loguru.Logger,
-        cloudType: CloudType = CloudType.COMMUNITY,
-    ) -> RunPodInstance:
-        """Creates a new spot instance using the API"""
-
-        try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
-                params = {
-                    "podName": podName,
-                    "templateId": templateId,
-                    "containerDiskSize": containerDiskSize,
-                    "volumeSize": volumeSize,
-                    "gpuCount": gpuCount,
-                    "gpuTypeId": str(gpuTypeId),
-                    "minVcpuCount": minVcpuCount,
-                    "minMemoryInGb": minMemoryInGb,
-                    "max_bid": max_bid,
-                    "cloudType": str(cloudType)
-                }
-
-                query = gql(
-                    """mutation {{
-                                podRentInterruptable(
-                                    input: {{
-                                        bidPerGpu: {max_bid},
-                                        cloudType: {cloudType},
-                                        gpuCount: {gpuCount},
-                                        volumeInGb: {volumeSize},
-                                        containerDiskInGb: {containerDiskSize},
-                                        minVcpuCount: {minVcpuCount},
-                                        minMemoryInGb: {minMemoryInGb},
-                                        gpuTypeId: "{gpuTypeId}",
-                                        name: "{podName}",
-                                        templateId: "{templateId}",
-                                    }}
-                                ) {{
-                                    id
-                                    imageName
-                                    podType
-                                    machineId
-                                    costPerHr
-                                    gpuCount
-                                    vcpuCount
-                                    memoryInGb
-                                    imageName
-                                    desiredStatus
-                                    machine {{
-                                        podHostId
-                                        gpuDisplayName
-                                    }}
-                                }}
-                            }}""".format(
-                        **params
-                    )
-                )
-
-                data = await session.execute(query)
-                pod_data: Dict[str, str] = data["podRentInterruptable"]
-
-                pod: RunPodInstance = RunPodInstance(
-                    podName=params["podName"],
-                    cost=float(pod_data["costPerHr"]),
-                    podId=pod_data["id"],
-                    podHostId=pod_data["machine"]["podHostId"],
-                    spot=pod_data["podType"] == "INTERRUPTABLE",
-                    gpuDisplayName=gpuTypeId,
-                    gpuCount=int(pod_data["gpuCount"]),
-                    vcpuCount=int(pod_data["vcpuCount"]),
-                    memoryInGb=int(pod_data["memoryInGb"]),
-                    cloudType=cloudType,
-                    imageName=pod_data["imageName"],
-                    desiredStatus=PodStatus[pod_data["desiredStatus"]],
-                )
-
-                return pod
+        cloudType: CloudType,
+        spot: bool,
+        timeout: float,
+    ) -> Optional[RunPodInstance]:
+        """
+        Creates a new instance from the mutation input shared by all create variants,
+        then waits up to timeout seconds for it to show up
 
-        except (TransportServerError, TransportQueryError) as e:
-            if "outbid" in e.errors[0]["message"]:
-                raise OutbidException(e.errors[0]["message"])
-            else:
-                logger.exception(e)
-            return None
+        :param params: the input, without cloudType and gpuTypeId (and bidPerGpu for spot instances)
+        :raises OutbidException: if the max bid of a spot instance is too low
+        :raises RunPodTimeoutException: if the pod does not show up within timeout
+        """
+        params = {"cloudType": cloudType.value, "gpuTypeId": gpuTypeId.value, **params}
+        if spot:
+            query, field = _RENT_INTERRUPTABLE_MUTATION, "podRentInterruptable"
+        else:
+            query, field = _DEPLOY_ON_DEMAND_MUTATION, "podFindAndDeployOnDemand"
+            params.pop("bidPerGpu", None)
 
-    async def __create_on_demand_instance(
-        self,
-        podName: str,
-        imageName: str,
-        containerDiskSize: int,
-        volumeSize: int,
-        volumePath: str,
-        gpuCount: int,
-        gpuTypeId: GPUTypeId,
-        minVcpuCount: int,
-        minMemoryInGb: int,
-        args: str,
-        logger: loguru.Logger,
-        cloudType: CloudType = CloudType.COMMUNITY,
-    ) -> RunPodInstance:
-        """Creates a new spot instance using the API"""
         try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
-                # make post request with bearer token
-                params = {
-                    "podName": podName,
-                    "imageName": imageName,
-                    "containerDiskSize": containerDiskSize,
-                    "volumeSize": volumeSize,
-                    "volumePath": volumePath,
-                    "gpuCount": gpuCount,
-                    "gpuTypeId": gpuTypeId.value,
-                    "args": args,
-                    "minVcpuCount": minVcpuCount,
-                    "minMemoryInGb": minMemoryInGb,
-                    "cloudType": cloudType.value,
-                }
-
-                query = gql(
-                    """mutation {{
-                                podFindAndDeployOnDemand(
-                                    input: {{
-                                        cloudType: {cloudType},
-                                        gpuCount: {gpuCount},
-                                        volumeInGb: {volumeSize},
-                                        containerDiskInGb: {containerDiskSize},
-                                        minVcpuCount: {minVcpuCount},
-                                        minMemoryInGb: {minMemoryInGb},
-                                        gpuTypeId: "{gpuTypeId}",
-                                        name: "{podName}",
-                                        imageName: "{imageName}",
-                                        dockerArgs: {args},
-                                        volumeMountPath: "{volumePath}",
-                                    }}
-                                ) {{
-                                    id
-                                    imageName
-                                    podType
-                                    machineId
-                                    costPerHr
-                                    gpuCount
-                                    vcpuCount
-                                    memoryInGb
-                                    desiredStatus
-                                    machine {{
-                                        podHostId
-                                        gpuDisplayName
-                                    }}
-                                }}
-                            }}""".format(
-                        **params
-                    )
-                )
-
-                data = await session.execute(query)
-                print(data)
-                pod_data: Dict[str, str] = data["podRentInterruptable"]
-
-                pod: RunPodInstance = RunPodInstance(
-                    podName=params["podName"],
-                    cost=float(pod_data["costPerHr"]),
-                    podId=pod_data["id"],
-                    podHostId=pod_data["machine"]["podHostId"],
-                    spot=pod_data["podType"] == "INTERRUPTABLE",
-                    gpuDisplayName=gpuTypeId,
-                    gpuCount=int(pod_data["gpuCount"]),
-                    vcpuCount=int(pod_data["vcpuCount"]),
-                    memoryInGb=int(pod_data["memoryInGb"]),
-                    cloudType=cloudType,
-                    imageName=imageName,
-                    desiredStatus=PodStatus[pod_data["desiredStatus"]]
-                )
+            session = await self._get_session()
+            data = await session.execute(query, {"input": params})
+            pod_data: Dict[str, Any] = data[field]
 
-                return pod
+        except TransportQueryError as e:
+            if _is_outbid(e.errors):
+                raise OutbidException(e.errors[0].get("message", ""))
+            logger.exception(e)
+            return None
 
-        except (TransportServerError, TransportQueryError) as e:
-            if "outbid" in e.errors[0]["message"]:
-                raise OutbidException(e.errors[0]["message"])
-            else:
-                logger.exception(e)
+        except TransportServerError as e:
+            logger.exception(e)
             return None
 
-    async def __create_on_demand_instance_from_template_id(
-        self,
-        podName: str,
-        templateId: str,
-        containerDiskSize: int,
-        volumeSize: int,
-        gpuCount: int,
-        gpuTypeId: GPUTypeId,
-        minVcpuCount: int,
-        minMemoryInGb: int,
-        logger: loguru.Logger,
-        cloudType: CloudType = CloudType.COMMUNITY,
-    ) -> RunPodInstance:
-        """Creates a new spot instance using the API"""
-        try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
-                # make post request with bearer token
-                params = {
-                    "podName": podName,
-                    "templateId": templateId,
-                    "containerDiskSize": containerDiskSize,
-                    "volumeSize": volumeSize,
-                    "gpuCount": gpuCount,
-                    "gpuTypeId": gpuTypeId.value,
-                    "minVcpuCount": minVcpuCount,
-                    "minMemoryInGb": minMemoryInGb,
-                    "cloudType": cloudType.value,
-                }
+        pod: RunPodInstance = RunPodInstance(
+            podName=params["name"],
+            cost=float(pod_data["costPerHr"]),
+            podId=pod_data["id"],
+            podHostId=pod_data["machine"]["podHostId"],
+            spot=pod_data["podType"] == "INTERRUPTABLE",
+            gpuDisplayName=gpuTypeId,
+            gpuCount=pod_data["gpuCount"],
+            vcpuCount=int(pod_data["vcpuCount"]),
+            memoryInGb=int(pod_data["memoryInGb"]),
+            cloudType=cloudType,
+            imageName=pod_data["imageName"],
+            desiredStatus=_POD_STATUSES[pod_data["desiredStatus"]],
+        )
 
-                query = gql(
-                    """mutation {{
-                                podFindAndDeployOnDemand(
-                                    input: {{
-                                        cloudType: {cloudType},
-                                        gpuCount: {gpuCount},
-                                        volumeInGb: {volumeSize},
-                                        containerDiskInGb: {containerDiskSize},
-                                        minVcpuCount: {minVcpuCount},
-                                        minMemoryInGb: {minMemoryInGb},
-                                        gpuTypeId: "{gpuTypeId}",
-                                        name: "{podName}",
-                                        templateId: "{templateId}",
-                                    }}
-                                ) {{
-                                    id
-                                    imageName
-                                    podType
-                                    machineId
-                                    costPerHr
-                                    gpuCount
-                                    vcpuCount
-                                    memoryInGb
-                                    imageName
-                                    desiredStatus
-                                    machine {{
-                                        podHostId
-                                        gpuDisplayName
-                                    }}
-                                }}
-                            }}""".format(
-                        **params
-                    )
-                )
+        await self.__wait_for_pod(pod.podId, logger, timeout)
 
-                data = await session.execute(query)
-                print(data)
-                pod_data: Dict[str, str] = data["podRentInterruptable"]
-
-                pod: RunPodInstance = RunPodInstance(
-                    podName=params["podName"],
-                    cost=float(pod_data["costPerHr"]),
-                    podId=pod_data["id"],
-                    podHostId=pod_data["machine"]["podHostId"],
-                    spot=pod_data["podType"] == "INTERRUPTABLE",
-                    gpuDisplayName=gpuTypeId,
-                    gpuCount=int(pod_data["gpuCount"]),
-                    vcpuCount=int(pod_data["vcpuCount"]),
-                    memoryInGb=int(pod_data["memoryInGb"]),
-                    cloudType=cloudType,
-                    imageName=pod_data["imageName"],
-                    desiredStatus=PodStatus[pod_data["desiredStatus"]],
-                )
+        return pod
 
-                return pod
+    async def __wait_for_pod(self, podId: str, logger: loguru.Logger, timeout: float) -> RunPodInstance:
+        """Waits for the pod to show up, polling it together with any other pods being created
 
-        except (TransportServerError, TransportQueryError) as e:
-            if "outbid" in e.errors[0]["message"]:
-                raise OutbidException(e.errors[0]["message"])
-            else:
-                logger.exception(e)
-            return None
+        :raises RunPodTimeoutException: if the pod does not show up within timeout
+        """
+        try:
+            return await asyncio.wait_for(self._pod_waiter.wait(podId, logger), timeout)
+        except asyncio.TimeoutError:
+            raise RunPodTimeoutException(
+                f"Pod {podId} did not start within {timeout} seconds"
+            ) from None
 
+    @_invalidates_pod_cache
     async def create_instance(
         self,
         max_bid: float,
@@ -668,54 +890,28 @@ class RunPod:
         logger: loguru.Logger,
         cloudType: CloudType = CloudType.COMMUNITY,
         spot: bool = True,
+        timeout: float = POD_START_TIMEOUT,
     ) -> RunPodInstance:
-        """Creates a new instance"""
-        pod: RunPodInstance = None
-        args = json.dumps(args)
-        if spot:
-            pod = await self.__create_spot_instance(
-                max_bid,
-                podName,
-                imageName,
-                containerDiskSize,
-                volumeSize,
-                volumePath,
-                gpuCount,
-                gpuTypeId,
-                minVcpuCount,
-                minMemoryInGb,
-                args,
-                logger,
-                cloudType,
-            )
-        else:
-            pod = await self.__create_on_demand_instance(
-                podName,
-                imageName,
-                containerDiskSize,
-                volumeSize,
-                volumePath,
-                gpuCount,
-                gpuTypeId,
-                minVcpuCount,
-                minMemoryInGb,
-                args,
-                logger,
-                cloudType,
-            )
-
-        if pod is None:
-            return None
-
-        podId = pod.podId
-
-        pod_ = await self.get_pod_by_id(podId, logger)
-        while pod_ is None:
-            await asyncio.sleep(3)  # wait for pod to finish start
-            pod_ = await self.get_pod_by_id(podId, logger)
-
-        return pod
+        """Creates a new instance, waiting up to timeout seconds for it to show up
 
+        :raises RunPodTimeoutException: if the pod does not show up within timeout
+        """
+        params = {
+            "bidPerGpu": max_bid,
+            "gpuCount": gpuCount,
+            "volumeInGb": volumeSize,
+            "containerDiskInGb": containerDiskSize,
+            "minVcpuCount": minVcpuCount,
+            "minMemoryInGb": minMemoryInGb,
+            "name": podName,
+            "imageName": imageName,
+            "dockerArgs": args,
+            "volumeMountPath": volumePath,
+        }
+
+        return await self.__create_instance(params, gpuTypeId, logger, cloudType, spot, timeout)
+
+    @_invalidates_pod_cache
     async def create_instance_from_template_id(
         self,
         max_bid: float,
@@ -730,421 +926,385 @@ class RunPod:
         logger: loguru.Logger,
         cloudType: CloudType = CloudType.COMMUNITY,
         spot: bool = True,
+        timeout: float = POD_START_TIMEOUT,
     ) -> RunPodInstance:
-        """Creates a new instance"""
-        pod: RunPodInstance = None
-        if spot:
-            pod = await self.__create_spot_instance_from_template_id(
-                max_bid,
-                podName,
-                templateId,
-                containerDiskSize,
-                volumeSize,
-                gpuCount,
-                gpuTypeId,
-                minVcpuCount,
-                minMemoryInGb,
-                logger,
-                cloudType,
-            )
-        else:
-            pod = await self.__create_on_demand_instance_from_template_id(
-                podName,
-                templateId,
-                containerDiskSize,
-                volumeSize,
-                gpuCount,
-                gpuTypeId,
-                minVcpuCount,
-                minMemoryInGb,
-                logger,
-                cloudType,
-            )
-
-        if pod is None:
-            return None
+        """Creates a new instance, waiting up to timeout seconds for it to show up
 
-        podId = pod.podId
-
-        pod_ = await self.get_pod_by_id(podId, logger)
-        while pod_ is None:
-            await asyncio.sleep(3)  # wait for pod to finish start
-            pod_ = await self.get_pod_by_id(podId, logger)
+        :raises RunPodTimeoutException: if the pod does not show up within timeout
+        """
+        params = {
+            "bidPerGpu": max_bid,
+            "gpuCount": gpuCount,
+            "volumeInGb": volumeSize,
+            "containerDiskInGb": containerDiskSize,
+            "minVcpuCount": minVcpuCount,
+            "minMemoryInGb": minMemoryInGb,
+            "name": podName,
+            "templateId": templateId,
+        }
+
+        return await self.__create_instance(params, gpuTypeId, logger, cloudType, spot, timeout)
+
+    async def create_instances(
+        self, specs: List[Dict[str, Any]], logger: loguru.Logger
+    ) -> List[Union[Optional[RunPodInstance], BaseException]]:
+        """
+        Creates many instances concurrently, the new pods are waited for together in shared polls
 
-        return pod
+        :param specs: for each pod, the keyword arguments (but logger) of create_instance,
+            or of create_instance_from_template_id if they have a templateId
+        :param logger: the logger to use
+        :return: for each spec, in order, the created pod, None if it could not be created,
+            or the exception its creation raised (e.g. OutbidException or RunPodTimeoutException)
+        """
+        return await asyncio.gather(
+            *(
+                self.create_instance_from_template_id(**spec, logger=logger)
+                if "templateId" in spec
+                else self.create_instance(**spec, logger=logger)
+                for spec in specs
+            ),
+            return_exceptions=True,
+        )
 
     async def get_pod_by_id(
         self, podId: str, logger: loguru.Logger
     ) -> Optional[RunPodInstance]:
         """Gets a pod from the API by its podId"""
-        try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
+        return await self.__lookup(
+            ("pod", podId), self.pod_cache_ttl, lambda: self.__get_pod_by_id(podId, logger)
+        )
 
-                params = {
-                    "podId": podId,
-                }
+    async def __get_pod_by_id(
+        self, podId: str, logger: loguru.Logger
+    ) -> Optional[RunPodInstance]:
+        query = _POD_BY_ID_QUERY
+        params = {
+            "podId": podId,
+        }
 
-                query = gql(
-                    """query myPods($podId: String!) {
-                            pod (input: {podId: $podId}) {
-                                id
-                                podType
-                                costPerHr
-                                name
-                                gpuCount
-                                vcpuCount
-                                memoryInGb
-                                imageName
-                                desiredStatus
-                                machine {
-                                    podHostId
-                                    gpuDisplayName
-                                    secureCloud
-                                }
-                            }
-                            
-                    }"""
-                )
+        try:
+            # Errors are checked in the result, not raised:
+            # a missing pod is the common case while its creation is polled
+            result = await self._execute_result(query, params)
+        except TransportServerError as e:
+            logger.opt(lazy=True).exception("{}\n{}", lambda: e, lambda: _document_source(query))
+            raise RunPodException(f"Failed to get pod {podId} with error: {e}")
 
-                data = await session.execute(query, params)
+        if result.errors:
+            error = result.errors[0]
+            if (error.get("extensions") or {}).get("code") == "INTERNAL_SERVER_ERROR":
+                # podId not found
+                return None
 
-                pod_data: Dict[str, str] = data["pod"]
+            logger.opt(lazy=True).error("{}\n{}", lambda: error, lambda: _document_source(query))
+            raise RunPodException(f"Failed to get pod {podId} with error: {error}")
 
-                podName = pod_data["name"]
-                podId = pod_data["id"]
-                podHostId = pod_data["machine"]["podHostId"]
-                cost = float(pod_data["costPerHr"]) if "costPerHr" in pod_data else None
-                # Not a typo, enum has a spelling issue in API
-                spot = pod_data["podType"] == "INTERRUPTABLE"
-                try:
-                    gpuDisplayName = GPUTypeId.from_gpuDisplayName(
-                        pod_data["machine"]["gpuDisplayName"]
-                    )
-                except ValueError:
-                    gpuDisplayName = None
-                gpuCount = int(pod_data["gpuCount"])
-                vcpuCount = int(pod_data["vcpuCount"])
-                memoryInGb = int(pod_data["memoryInGb"])
-                imageName = pod_data["imageName"]
-                secureCloud: bool = pod_data["machine"]["secureCloud"]
-
-                pod = RunPodInstance(
-                    podName=podName,
-                    cost=cost,
-                    podId=podId,
-                    podHostId=podHostId,
-                    spot=spot,
-                    gpuDisplayName=gpuDisplayName,
-                    gpuCount=gpuCount,
-                    vcpuCount=vcpuCount,
-                    memoryInGb=memoryInGb,
-                    imageName=imageName,
-                    cloudType=CloudType.SECURE if secureCloud else CloudType.COMMUNITY,
-                    desiredStatus=PodStatus[pod_data["desiredStatus"]]
-                )
+        return _pod_from_data(result.data["pod"])
 
-                return pod
-        except TransportQueryError as e:
-            if (
-                len(e.errors) >= 1
-                and e.errors[0]["extensions"]["code"] == "INTERNAL_SERVER_ERROR"
-            ):
-                # podId not found
-                return None
-            else:
-                logger.exception(e)
-                logger.exception(query)
-                raise RunPodException(f"Failed to get pod {podId} with error: {e}")
+    async def get_pods_by_ids(
+        self, podIds: List[str], logger: loguru.Logger
+    ) -> Dict[str, Optional[RunPodInstance]]:
+        """
+        Gets many pods from the API by their podIds, batching the queries into as few requests as possible
 
-        except TransportServerError as e:
-            logger.exception(e)
-            logger.exception(query)
-            raise RunPodException(f"Failed to get pod {podId} with error: {e}")
+        :param podIds: the podIds to get
+        :param logger: the logger to use
+        :return: a dict mapping each podId to its pod, or None if it was not found or failed
+        """
+        results = await self.__execute_batched(
+            "query", "pod", "String!", "input: {podId: %s}", _POD_SELECTION, podIds, logger
+        )
 
-    async def get_pods(self, logger: loguru.Logger) -> List[RunPodInstance]:
-        """Gets all the pods from the API"""
+        return {
+            podId: _pod_from_data(data) if ok and data is not None else None
+            for podId, (ok, data) in zip(podIds, results)
+        }
+
+    async def iter_pods(self, logger: loguru.Logger) -> AsyncIterator[RunPodInstance]:
+        """
+        Gets all the pods from the API, building each RunPodInstance only as it is iterated,
+        e.g. ``async for pod in runpod.iter_pods(logger): ...`` can stop at the first match
+        """
         try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
-                query = gql(
-                    """query myPods {
-                            myself {
-                                pods {
-                                    id
-                                    name
-                                    podType
-                                    gpuCount
-                                    vcpuCount
-                                    memoryInGb
-                                    imageName
-                                    costPerHr
-                                    desiredStatus
-                                    machine {
-                                        podHostId
-                                        gpuDisplayName
-                                        secureCloud
-                                    }
-                                }
-                            }
-                    }"""
-                )
+            session = await self._get_session()
+            query = _PODS_QUERY
 
-                data = await session.execute(query)
-                pods_data: List[Dict[str, str]] = data["myself"]["pods"]
-                pods: List[RunPodInstance] = []
-
-                for pod_data in pods_data:
-                    podName = pod_data["name"]
-                    podId = pod_data["id"]
-                    podHostId = pod_data["machine"]["podHostId"]
-                    cost = (
-                        float(pod_data["costPerHr"])
-                        if "costPerHr" in pod_data
-                        else None
-                    )
-                    # Not a typo, enum has a spelling issue in API
-                    spot = pod_data["podType"] == "INTERRUPTABLE"
-                    try:
-                        gpuDisplayName = GPUTypeId.from_gpuDisplayName(
-                            pod_data["machine"]["gpuDisplayName"]
-                        )
-                    except ValueError:
-                        gpuDisplayName = None
-                    gpuCount = int(pod_data["gpuCount"])
-                    vcpuCount = int(pod_data["vcpuCount"])
-                    memoryInGb = int(pod_data["memoryInGb"])
-                    imageName = pod_data["imageName"]
-                    secureCloud: bool = pod_data["machine"]["secureCloud"]
-
-                    pod = RunPodInstance(
-                        podName=podName,
-                        cost=cost,
-                        podId=podId,
-                        podHostId=podHostId,
-                        spot=spot,
-                        gpuDisplayName=gpuDisplayName,
-                        gpuCount=gpuCount,
-                        vcpuCount=vcpuCount,
-                        memoryInGb=memoryInGb,
-                        imageName=imageName,
-                        cloudType=CloudType.SECURE if secureCloud else CloudType.COMMUNITY,
-                        desiredStatus=PodStatus[pod_data["desiredStatus"]],
-                    )
-                    pods.append(pod)
-
-                return pods
+            data = await session.execute(query)
+            pods_data: List[Dict[str, Any]] = data["myself"]["pods"]
 
         except (TransportServerError, TransportQueryError) as e:
             logger.exception(e)
             raise RunPodException(f"Failed to get pods with error: {e}")
 
+        for pod_data in pods_data:
+            yield _pod_from_data(pod_data)
+
+    async def get_pods(self, logger: loguru.Logger) -> List[RunPodInstance]:
+        """Gets all the pods from the API"""
+
+        async def fetch() -> List[RunPodInstance]:
+            return [pod async for pod in self.iter_pods(logger)]
+
+        # A copy, so callers can't modify the shared (cached) list
+        return list(await self.__lookup(("pods",), self.pod_cache_ttl, fetch))
+
     async def test_connection(self, logger: loguru.Logger) -> bool:
-        """Tests the connection to the runpod api"""
+        """Tests the connection to the runpod api, a successful result is cached until close()"""
+        if self._connected:
+            return True
+
         try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
-                # make post request with bearer token
-                query = gql(
-                    """query myPods {
-                            myself {
-                                id
-                            }
-                    }"""
-                )
+            session = await self._get_session()
+            # make post request with bearer token
+            query = _TEST_CONNECTION_QUERY
 
-                result = await session.execute(query)
-                if result is None:
-                    return False
+            result = await session.execute(query)
 
-                # Authentication is successful if we are not guest
-                return result["myself"]["id"] != "guest"
+            # Authentication is successful if we are not guest
+            myself: Dict[str, Any] = (result or {}).get("myself") or {}
+            self._connected = myself.get("id") not in (None, "guest")
+            return self._connected
 
         except (TransportServerError, TransportQueryError) as e:
             logger.exception(e)
             return False
 
+    @_invalidates_pod_cache
     async def stop_instance(self, podId: str, logger: loguru.Logger) -> bool:
-        """Stops an instance by the podId"""
-        try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
+        """Stops an instance by the podId, concurrent stops of the same pod share one request"""
+        return await self.__share(("podStop", podId), lambda: self.__stop_instance(podId, logger))
 
-                params = {
-                    "podId": podId,
-                }
+    async def __stop_instance(self, podId: str, logger: loguru.Logger) -> bool:
+        query = _STOP_POD_MUTATION
+        params = {
+            "podId": podId,
+        }
 
-                query = gql(
-                    """mutation($podId: String!) {
-                        podStop(input: {podId: $podId}) {
-                            id
-                            desiredStatus
-                        }
-                    }"""
-                )
+        try:
+            session = await self._get_session()
+            data = await session.execute(query, params)
 
-                data = await session.execute(query, params)
+            return data["podStop"]["desiredStatus"] == "EXITED"
 
-                return (
-                    data["podStop"]["id"] == podId
-                    and data["podStop"]["desiredStatus"] == "EXITED"
-                )
+        except TransportQueryError as e:
+            # Refused by the API (e.g. an unknown pod), the errors say why, a traceback would not
+            logger.bind(op="podStop", podId=podId).warning("Failed to stop pod {}: {}", podId, e.errors)
+            return False
 
-        except (TransportServerError, TransportQueryError) as e:
-            logger.exception(e)
-            logger.exception(query)
+        except TransportServerError as e:
+            logger.opt(lazy=True).exception("{}\n{}", lambda: e, lambda: _document_source(query))
             return False
 
+    @_invalidates_pod_cache
     async def destroy_instance(self, podId: str, logger: loguru.Logger) -> bool:
         """Destroys the instance by the podId"""
-        try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
-
-                params = {
-                    "input": {
-                        "podId": podId,
-                    }
-                }
+        query = _TERMINATE_POD_MUTATION
+        params = {
+            "input": {
+                "podId": podId,
+            }
+        }
 
-                query = gql(
-                    """mutation terminatePod($input: PodTerminateInput!) {
-                        podTerminate(input: $input)
-                    }"""
-                )
+        try:
+            session = await self._get_session()
+            data = await session.execute(query, params)
 
-                data = await session.execute(query, params)
+            return data["podTerminate"] is None
 
-                return data["podTerminate"] is None
+        except TransportQueryError as e:
+            logger.bind(op="podTerminate", podId=podId).warning("Failed to destroy pod {}: {}", podId, e.errors)
+            return False
 
-        except (TransportServerError, TransportQueryError) as e:
-            logger.exception(e)
-            logger.exception(query)
+        except TransportServerError as e:
+            logger.opt(lazy=True).exception("{}\n{}", lambda: e, lambda: _document_source(query))
             return False
 
-    async def __start_spot_instance(
-        self, podId: str, gpuCount: int, max_bid: float, logger: loguru.Logger
-    ) -> bool:
-        """Starts a spot instance by the podId with a gpuCount and a max_bid per GPU"""
-        try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
-
-                params = {
-                    "podId": podId,
-                    "maxBid": max_bid,
-                    "gpuCount": gpuCount,
+    async def __execute_batched(
+        self,
+        operation: str,
+        field: str,
+        variableType: str,
+        argument: str,
+        selection: str,
+        values: List[Any],
+        logger: loguru.Logger,
+    ) -> List[Tuple[bool, Any]]:
+        """
+        Executes field once per value using aliases, with at most MAX_BATCH_SIZE aliases per request
+
+        :return: a (succeeded, data) tuple for each value, in order.
+            For a failed value data is its error message, or None if there is none
+        """
+        results: List[Tuple[bool, Any]] = []
+
+        for start in range(0, len(values), MAX_BATCH_SIZE):
+            batch = values[start : start + MAX_BATCH_SIZE]
+            query = _batch_document(
+                operation, field, variableType, argument, selection, len(batch)
+            )
+            params = {f"p{i}": value for i, value in enumerate(batch)}
+            errors: Dict[str, str] = {}
+
+            try:
+                # Errors are checked in the result, not raised, as failing aliases are expected
+                result = await self._execute_result(query, params)
+            except TransportServerError as e:
+                logger.exception(e)
+                data = {}
+            else:
+                # Aliases without an error still ran, their results are in the data
+                data = result.data or {}
+                errors = {
+                    error["path"][0]: error["message"]
+                    for error in result.errors or []
+                    if error.get("path")
                 }
+                if result.errors and not errors:
+                    # Request level error, e.g. an invalid document
+                    logger.error(result.errors)
 
-                query = gql(
-                    """mutation($podId: String!, $maxBid: Float!) {
-                        podBidResume(input: {podId: $podId, bidPerGpu: $maxBid, gpuCount: 1}) {
-                            id
-                            desiredStatus
-                            imageName
-                            env
-                            machineId
-                            machine {
-                            podHostId
-                            }
-                        }
-                    }"""
-                )
+            for i in range(len(batch)):
+                alias = f"p{i}"
+                if alias in data and alias not in errors:
+                    results.append((True, data[alias]))
+                else:
+                    results.append((False, errors.get(alias)))
 
-                data = await session.execute(query, params)
-                pod_data: Dict[str, str] = data["podBidResume"]
+        return results
 
-                return (
-                    pod_data["id"] == podId and pod_data["desiredStatus"] == "RUNNING"
-                )
-        except TransportQueryError as e:
-            if (
-                len(e.errors) >= 1
-                and "Cannot resume a pod that is not in exited state"
-                in e.errors[0]["message"]
-            ):
+    @_invalidates_pod_cache
+    async def stop_instances(self, podIds: List[str], logger: loguru.Logger) -> Dict[str, bool]:
+        """
+        Stops many instances by their podIds, batching the mutations into as few requests as possible
+
+        :param podIds: the podIds to stop
+        :param logger: the logger to use
+        :return: a dict mapping each podId to whether it was stopped
+        """
+        results = await self.__execute_batched(
+            "mutation", "podStop", "String!", "input: {podId: %s}", "{ desiredStatus }", podIds, logger
+        )
+
+        stopped: Dict[str, bool] = {}
+        for podId, (ok, data) in zip(podIds, results):
+            if not ok and data is not None:
+                logger.error(f"Pod {podId}: {data}")
+            stopped[podId] = ok and data is not None and data["desiredStatus"] == "EXITED"
+
+        return stopped
+
+    @_invalidates_pod_cache
+    async def destroy_instances(self, podIds: List[str], logger: loguru.Logger) -> Dict[str, bool]:
+        """
+        Destroys many instances by their podIds, batching the mutations into as few requests as possible
+
+        :param podIds: the podIds to destroy
+        :param logger: the logger to use
+        :return: a dict mapping each podId to whether it was destroyed
+        """
+        results = await self.__execute_batched(
+            "mutation",
+            "podTerminate",
+            "PodTerminateInput!",
+            "input: %s",
+            "",
+            [{"podId": podId} for podId in podIds],
+            logger,
+        )
+
+        destroyed: Dict[str, bool] = {}
+        for podId, (ok, data) in zip(podIds, results):
+            if not ok and data is not None:
+                logger.error(f"Pod {podId}: {data}")
+            destroyed[podId] = ok and data is None
+
+        return destroyed
+
+    @_invalidates_pod_cache
+    async def start_instances(
+        self,
+        podIds: List[str],
+        gpuCounts: List[int],
+        logger: loguru.Logger,
+        max_bid: Optional[float] = None,
+        spot: bool = False,
+    ) -> Dict[str, bool]:
+        """
+        Starts many instances by their podIds, batching the mutations into as few requests as possible
+
+        :param podIds: the podIds to start
+        :param gpuCounts: the gpuCount to start each pod with
+        :param logger: the logger to use
+        :param max_bid: the max bid per GPU, for spot instances
+        :param spot: whether to start the pods as spot instances
+        :return: a dict mapping each podId to whether it was started (or was already running)
+        """
+        if spot:
+            field, variableType = "podBidResume", "PodBidResumeInput!"
+            values = [
+                {"podId": podId, "bidPerGpu": max_bid, "gpuCount": gpuCount}
+                for podId, gpuCount in zip(podIds, gpuCounts)
+            ]
+        else:
+            field, variableType = "podResume", "PodResumeInput!"
+            values = [
+                {"podId": podId, "gpuCount": gpuCount}
+                for podId, gpuCount in zip(podIds, gpuCounts)
+            ]
+
+        results = await self.__execute_batched(
+            "mutation", field, variableType, "input: %s", "{ desiredStatus }", values, logger
+        )
+
+        started: Dict[str, bool] = {}
+        for podId, (ok, data) in zip(podIds, results):
+            if ok:
+                started[podId] = data is not None and data["desiredStatus"] == "RUNNING"
+            elif data is not None and _POD_NOT_EXITED_MESSAGE in data:
                 logger.info(f"Pod {podId} is already running")
-                return True
-            elif "outbid" in e.errors[0]["message"]:
-                raise OutbidException(e.errors[0]["message"])
+                started[podId] = True
             else:
-                logger.exception(e)
-                logger.exception(query)
-                return False
+                if data is not None:
+                    logger.error(f"Pod {podId}: {data}")
+                started[podId] = False
 
-        except TransportServerError as e:
-            logger.exception(e)
-            logger.exception(query)
-            return False
+        return started
 
-    async def __start_on_demand_instance(
-        self, podId: str, gpuCount: int, logger: loguru.Logger
+    async def __resume_instance(
+        self, podId: str, gpuCount: int, logger: loguru.Logger, spot: bool, max_bid: Optional[float]
     ) -> bool:
-        """Starts an on-demand instance by the podId with a gpuCount"""
-        try:
-            async with Client(
-                transport=self.gql_transport,
-                fetch_schema_from_transport=False,
-            ) as session:
-
-                params = {
-                    "podId": podId,
-                    "gpuCount": gpuCount,
-                }
-
-                query = gql(
-                    """mutation($podId: String!, $maxBid: Float!) {
-                        podResume(input: {podId: $podId, gpuCount: 1}) {
-                            id
-                            desiredStatus
-                            imageName
-                            env
-                            machineId
-                            machine {
-                            podHostId
-                            }
-                        }
-                    }"""
-                )
+        """Resumes an instance by the podId with a gpuCount, as a spot instance with a max_bid per GPU if spot"""
+        query, field = _RESUME_OPERATIONS[spot]
+        params = {
+            "podId": podId,
+            "gpuCount": gpuCount,
+        }
+        if spot:
+            params["maxBid"] = max_bid
 
-                data = await session.execute(query, params)
-                pod_data: Dict[str, str] = data["podResume"]
+        try:
+            session = await self._get_session()
+            data = await session.execute(query, params)
+            pod_data: Dict[str, str] = data[field]
 
-                return (
-                    pod_data["id"] == podId and pod_data["desiredStatus"] == "RUNNING"
-                )
+            return pod_data["desiredStatus"] == "RUNNING"
         except TransportQueryError as e:
-            if (
-                len(e.errors) >= 1
-                and "Cannot resume a pod that is not in exited state"
-                in e.errors[0]["message"]
-            ):
+            message: str = e.errors[0].get("message", "") if e.errors else ""
+            if _POD_NOT_EXITED_MESSAGE in message:
                 logger.info(f"Pod {podId} is already running")
                 return True
-            elif "outbid" in e.errors[0]["message"]:
-                raise OutbidException(e.errors[0]["message"])
+            elif _is_outbid(e.errors):
+                raise OutbidException(message)
             else:
-                logger.exception(e)
-                logger.exception(query)
+                logger.bind(op=field, podId=podId).warning("Failed to start pod {}: {}", podId, e.errors)
                 return False
 
         except TransportServerError as e:
-            logger.exception(e)
-            logger.exception(query)
+            logger.opt(lazy=True).exception("{}\n{}", lambda: e, lambda: _document_source(query))
             return False
 
+    @_invalidates_pod_cache
     async def start_instance(
         self,
         podId: str,
@@ -1152,9 +1312,9 @@ class RunPod:
         logger: loguru.Logger,
         max_bid: Optional[float] = None,
         spot: bool = False,
-    ):
-        """Starts an instance by the podId"""
-        if spot:
-            return await self.__start_spot_instance(podId, gpuCount, max_bid, logger)
-        else:
-            return await self.__start_on_demand_instance(podId, gpuCount, logger)
+    ) -> bool:
+        """Starts an instance by the podId, concurrent identical starts of the same pod share one request"""
+        return await self.__share(
+            ("resume", podId, gpuCount, spot, max_bid),
+            lambda: self.__resume_instance(podId, gpuCount, logger, spot, max_bid),
+        )
@@ -0,0 +1,143 @@
+"""Fake transports answering the RunPod API from memory, for the tests"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+
+from gql.transport.async_transport import AsyncTransport
+from graphql import DocumentNode, ExecutionResult, FieldNode, VariableNode
+
+
+def make_pod(podId: str, desiredStatus: str = "RUNNING") -> Dict[str, Any]:
+    return {
+        "id": podId,
+        "podType": "INTERRUPTABLE",
+        "costPerHr": 0.2,
+        "name": podId,
+        "gpuCount": 1,
+        "vcpuCount": 8.0,
+        "memoryInGb": 30.0,
+        "imageName": "image",
+        "desiredStatus": desiredStatus,
+        "machine": {
+            "podHostId": f"{podId}-host",
+            "gpuDisplayName": "RTX 3090",
+            "secureCloud": False,
+        },
+    }
+
+
+class FakeTransport(AsyncTransport):
+    """
+    Answers the pod queries and mutations, and the prices queries, from in-memory dicts.
+    The state is read when a request arrives, but the answer to a request for a
+    field in `held` waits until `release` is set
+    """
+
+    def __init__(self, *pods: Dict[str, Any]):
+        self.pods: Dict[str, Dict[str, Any]] = {pod["id"]: pod for pod in pods}
+        # Answers of gpuTypes(input: {id}), by id
+        self.gpu_types: Dict[str, Dict[str, Any]] = {}
+        # podIds for which the mutations succeed with a null payload
+        self.null_payloads: Set[str] = set()
+        # podIds of pods that exist but are not found by the queries yet, e.g. still being created
+        self.hidden: Set[str] = set()
+        # The top-level field names of each request received
+        self.requests: List[List[str]] = []
+        self.held: List[str] = []
+        self.release = asyncio.Event()
+
+    async def connect(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    def subscribe(self, *args, **kwargs):
+        raise NotImplementedError
+
+    async def execute(
+        self,
+        document: DocumentNode,
+        variable_values: Optional[Dict[str, Any]] = None,
+        operation_name: Optional[str] = None,
+        **kwargs,
+    ) -> ExecutionResult:
+        variable_values = variable_values or {}
+        fields = document.definitions[0].selection_set.selections
+        names = [field.name.value for field in fields]
+        self.requests.append(names)
+
+        data: Dict[str, Any] = {}
+        errors: List[Dict[str, Any]] = []
+        for field in fields:
+            key = field.alias.value if field.alias else field.name.value
+            try:
+                data[key] = self._answer(field.name.value, _input(field, variable_values))
+            except ValueError as e:
+                data[key] = None
+                errors.append({"message": str(e), "path": [key], "extensions": {"code": "INTERNAL_SERVER_ERROR"}})
+
+        if any(name in self.held for name in names):
+            await self.release.wait()
+
+        return ExecutionResult(data=data, errors=errors or None)
+
+    def _answer(self, name: str, input: Dict[str, Any]) -> Any:
+        if name == "myself":
+            return {"pods": [dict(pod) for pod in self.pods.values()]}
+        if name == "gpuTypes":
+            return [self.gpu_types[input["id"]]] if input["id"] in self.gpu_types else []
+
+        if name in ("podRentInterruptable", "podFindAndDeployOnDemand"):
+            # The created pod is named podId
+            pod = make_pod(input["name"])
+            pod["podType"] = "INTERRUPTABLE" if name == "podRentInterruptable" else "RESERVED"
+            self.pods[pod["id"]] = pod
+            return dict(pod)
+
+        pod = self.pods.get(input["podId"])
+        if pod is None or (name == "pod" and pod["id"] in self.hidden):
+            raise ValueError("pod not found")
+        if name == "pod":
+            return dict(pod)
+
+        if name == "podStop":
+            pod["desiredStatus"] = "EXITED"
+        elif name == "podTerminate":
+            del self.pods[pod["id"]]
+            return None
+        elif pod["desiredStatus"] != "EXITED":
+            # podResume and podBidResume
+            raise ValueError("Cannot resume a pod that is not in exited state")
+        else:
+            pod["desiredStatus"] = "RUNNING"
+
+        if pod["id"] in self.null_payloads:
+            return None
+        return {"desiredStatus": pod["desiredStatus"]}
+
+
+def _input(field: FieldNode, variable_values: Dict[str, Any]) -> Dict[str, Any]:
+    """The input argument of the field, either one variable or an object of variables"""
+    if not field.arguments:
+        return {}
+    value = field.arguments[0].value
+    if isinstance(value, VariableNode):
+        return variable_values[value.name.value]
+    return {item.name.value: variable_values[item.value.name.value] for item in value.fields}
+
+
+class ScriptedTransport(FakeTransport):
+    """Answers the requests, in order, with the given results"""
+
+    def __init__(self, *results: ExecutionResult):
+        super().__init__()
+        self.results = list(results)
+
+    async def execute(self, document: DocumentNode, *args, **kwargs) -> ExecutionResult:
+        self.requests.append([field.name.value for field in document.definitions[0].selection_set.selections])
+        return self.results.pop(0)
+
+
+def error_result(message: str, extensions: Optional[Dict[str, Any]] = None) -> ExecutionResult:
+    return ExecutionResult(data=None, errors=[{"message": message, "extensions": extensions}])
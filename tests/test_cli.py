@@ -0,0 +1,35 @@
+import asyncio
+from typing import List
+
+from loguru import logger
+
+from runpodpy import cli
+from runpodpy.config import Config
+from runpodpy.runpod import RunPod
+
+from fakes import FakeTransport, make_pod
+
+
+def capture(coroutine) -> List[str]:
+    """Runs the coroutine, returning the messages it logged"""
+    messages: List[str] = []
+    sink = logger.add(messages.append, format="{message}")
+    try:
+        asyncio.run(coroutine)
+    finally:
+        logger.remove(sink)
+    return messages
+
+
+def test_list_pods_shows_a_null_cost():
+    priced, unpriced = make_pod("a"), make_pod("b")
+    unpriced["costPerHr"] = None
+
+    async def list_pods():
+        async with RunPod(FakeTransport(priced, unpriced)) as runpod:
+            await cli.list_pods(runpod, Config(), logger)
+
+    (table,) = capture(list_pods())
+    rows = {line.split()[0]: line for line in table.splitlines() if line.startswith(("a ", "b "))}
+    assert "$0.20/hr" in rows["a"]
+    assert "N/A" in rows["b"]
@@ -0,0 +1,51 @@
+from argparse import ArgumentParser
+
+import pytest
+
+from runpodpy.config import Config, config_builder
+
+
+def test_str_reflects_in_place_changes_to_plain_children():
+    config = Config()
+    config["machine"] = {"podName": "a"}
+    assert "podName: a" in str(config)
+
+    config.machine["podName"] = "b"
+    assert "podName: b" in str(config)
+
+
+def test_str_reflects_changes_to_config_children():
+    config = Config()
+    config["machine"] = Config()
+    config.machine["podName"] = "a"
+    assert "podName: a" in str(config)
+
+    config.machine["podName"] = "b"
+    assert "podName: b" in str(config)
+
+
+def parser() -> ArgumentParser:
+    parser = ArgumentParser()
+    parser.add_argument("--machine.podName", dest="machine.podName", type=str)
+    parser.add_argument("--debug", action="store_true")
+    return parser
+
+
+def test_config_builder_nests_dotted_arguments(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["runpodpy", "--machine.podName", "a", "--debug"])
+    config = config_builder(parser(), strict=True)
+    assert config.machine.podName == "a"
+    assert config.debug is True
+
+
+def test_config_builder_strict_rejects_unknown_arguments(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["runpodpy", "--machine.podName", "a", "--unknown"])
+    with pytest.raises(SystemExit):
+        config_builder(parser(), strict=True)
+
+
+def test_config_builder_ignores_unknown_arguments_unless_strict(monkeypatch):
+    monkeypatch.setattr("sys.argv", ["runpodpy", "--machine.podName", "a", "--unknown"])
+    config = config_builder(parser())
+    assert config.machine.podName == "a"
+    assert "unknown" not in config
@@ -0,0 +1,34 @@
+import argparse
+
+from runpodpy.__main__ import SUBCOMMANDS_BY_NAME, _sniff_subcommand, build_parser
+
+
+def commands(parser: argparse.ArgumentParser) -> set:
+    """The names (and aliases) of the subcommands the parser was built with"""
+    (action,) = (action for action in parser._actions if isinstance(action, argparse._SubParsersAction))
+    return set(action.choices)
+
+
+def test_sniff_subcommand_skips_option_values():
+    parser = build_parser()
+    assert _sniff_subcommand(parser, ["--API_KEY", "stop", "start"]) == "start"
+    assert _sniff_subcommand(parser, ["--debug", "stop", "--all"]) == "stop"
+    assert _sniff_subcommand(parser, ["--help"]) is None
+    assert _sniff_subcommand(parser, []) is None
+
+
+def test_build_parser_builds_only_the_named_subcommand():
+    parser = build_parser(["--API_KEY", "k", "terminate", "--all"])
+    assert commands(parser) == {"destroy", "terminate"}
+
+    args = parser.parse_args(["--API_KEY", "k", "terminate", "--all"])
+    assert args.command == "terminate"
+    assert args.all
+
+
+def test_build_parser_builds_every_subcommand_without_a_known_one():
+    everything = set(SUBCOMMANDS_BY_NAME)
+    assert commands(build_parser()) == everything
+    assert commands(build_parser([])) == everything
+    assert commands(build_parser(["--help"])) == everything
+    assert commands(build_parser(["stpo"])) == everything
@@ -0,0 +1,328 @@
+import asyncio
+
+import pytest
+from gql.transport.exceptions import TransportServerError
+from graphql import ExecutionResult
+from loguru import logger
+
+from runpodpy import GPUTypeId, PodStatus
+from runpodpy import runpod as runpod_module
+from runpodpy.runpod import MAX_BATCH_SIZE, RunPod, RunPodException, RunPodTimeoutException
+
+from fakes import FakeTransport, ScriptedTransport, error_result, make_pod
+
+
+def run(test) -> None:
+    asyncio.run(test())
+
+
+def test_concurrent_get_pod_by_id_share_one_request():
+    async def test():
+        transport = FakeTransport(make_pod("a"))
+        async with RunPod(transport) as runpod:
+            pods = await asyncio.gather(*(runpod.get_pod_by_id("a", logger) for _ in range(5)))
+
+        assert [pod.podId for pod in pods] == ["a"] * 5
+        assert transport.requests == [["pod"]]
+
+    run(test)
+
+
+def test_pod_cache_ttl_reuses_lookups_until_a_mutation():
+    async def test():
+        transport = FakeTransport(make_pod("a"))
+        async with RunPod(transport, pod_cache_ttl=60) as runpod:
+            await runpod.get_pod_by_id("a", logger)
+            await runpod.get_pod_by_id("a", logger)
+            assert transport.requests == [["pod"]]
+
+            assert await runpod.stop_instance("a", logger)
+            pod = await runpod.get_pod_by_id("a", logger)
+
+        assert pod.desiredStatus == PodStatus.EXITED
+        assert transport.requests == [["pod"], ["podStop"], ["pod"]]
+
+    run(test)
+
+
+def test_lookup_after_a_mutation_does_not_join_an_older_fetch():
+    async def test():
+        transport = FakeTransport(make_pod("a"))
+        transport.held = ["myself"]
+        async with RunPod(transport) as runpod:
+            # Started before the stop, answered (with the old state) only after it
+            before = asyncio.ensure_future(runpod.get_pods(logger))
+            await asyncio.sleep(0)
+            assert await runpod.stop_instance("a", logger)
+
+            after = asyncio.ensure_future(runpod.get_pods(logger))
+            await asyncio.sleep(0)
+            transport.release.set()
+            before_pods, after_pods = await asyncio.gather(before, after)
+
+        assert before_pods[0].desiredStatus == PodStatus.RUNNING
+        assert after_pods[0].desiredStatus == PodStatus.EXITED
+        assert transport.requests == [["myself"], ["podStop"], ["myself"]]
+
+    run(test)
+
+
+def test_float_pod_fields_are_built_as_int():
+    async def test():
+        async with RunPod(FakeTransport(make_pod("a"))) as runpod:
+            pod = await runpod.get_pod_by_id("a", logger)
+
+        # vcpuCount and memoryInGb are Float in the API schema
+        assert type(pod.vcpuCount) is int and pod.vcpuCount == 8
+        assert type(pod.memoryInGb) is int and pod.memoryInGb == 30
+
+    run(test)
+
+
+def test_get_pod_by_id_returns_none_for_a_missing_pod():
+    async def test():
+        async with RunPod(FakeTransport()) as runpod:
+            assert await runpod.get_pod_by_id("missing", logger) is None
+
+    run(test)
+
+
+def test_batched_requests_keep_the_aliases_that_succeeded():
+    async def test():
+        transport = FakeTransport(make_pod("a"), make_pod("b"))
+        async with RunPod(transport) as runpod:
+            pods = await runpod.get_pods_by_ids(["a", "missing", "b"], logger)
+            stopped = await runpod.stop_instances(["a", "missing"], logger)
+
+        assert pods["a"].podId == "a" and pods["b"].podId == "b"
+        assert pods["missing"] is None
+        assert stopped == {"a": True, "missing": False}
+        assert transport.requests == [["pod", "pod", "pod"], ["podStop", "podStop"]]
+
+    run(test)
+
+
+def test_get_pod_by_id_raises_for_an_error_with_null_extensions():
+    async def test():
+        async with RunPod(ScriptedTransport(error_result("boom"))) as runpod:
+            with pytest.raises(RunPodException, match="boom"):
+                await runpod.get_pod_by_id("a", logger)
+
+    run(test)
+
+
+def test_failed_price_and_gpu_type_fetches_are_not_cached():
+    prices = {
+        "gpuTypes": [
+            {
+                "secureCloud": True,
+                "communityCloud": True,
+                "lowestPrice": {"minimumBidPrice": 0.2, "uninterruptablePrice": 0.4},
+            }
+        ]
+    }
+    gpu_types = {
+        "gpuTypes": [
+            {
+                "id": "NVIDIA GeForce RTX 3090",
+                "memoryInGb": 24,
+                "secureCloud": True,
+                "communityCloud": True,
+                "lowestPrice": {"minimumBidPrice": 0.2, "uninterruptablePrice": 0.4},
+            }
+        ]
+    }
+
+    async def test():
+        transport = ScriptedTransport(
+            error_result("busy"),
+            ExecutionResult(data=prices),
+            error_result("busy"),
+            ExecutionResult(data=gpu_types),
+        )
+        async with RunPod(transport, price_cache_ttl=60) as runpod:
+            assert await runpod.get_current_bid(GPUTypeId.RTX_3090, logger) is None
+            assert await runpod.get_current_bid(GPUTypeId.RTX_3090, logger) == 0.2
+            # Served from the cache
+            assert await runpod.get_on_demand_price(GPUTypeId.RTX_3090, logger) == 0.4
+
+            assert await runpod.get_gpu_types(logger) == []
+            assert [info.gpuTypeId for info in await runpod.get_gpu_types(logger)] == [GPUTypeId.RTX_3090]
+            assert len(await runpod.get_gpu_types(logger)) == 1
+
+        assert transport.requests == [["gpuTypes"]] * 4
+
+    run(test)
+
+
+def test_str_of_a_pod_with_a_null_cost():
+    pod = make_pod("a")
+    pod["costPerHr"] = None
+
+    async def test():
+        async with RunPod(FakeTransport(pod)) as runpod:
+            instance = await runpod.get_pod_by_id("a", logger)
+
+        assert instance.cost is None
+        assert " - N/A - " in str(instance)
+
+    run(test)
+
+
+class UnreachableTransport(FakeTransport):
+    async def connect(self) -> None:
+        raise TransportServerError("unreachable")
+
+
+def test_stop_and_destroy_report_a_failed_connect():
+    async def test():
+        runpod = RunPod(UnreachableTransport())
+        assert not await runpod.stop_instance("a", logger)
+        assert not await runpod.destroy_instance("a", logger)
+
+    run(test)
+
+
+def test_stop_and_destroy_instances_batch_and_report_each_pod():
+    async def test():
+        transport = FakeTransport(make_pod("a"), make_pod("b"), make_pod("c"))
+        # Stopped, but answered with a null payload
+        transport.null_payloads = {"b"}
+        async with RunPod(transport) as runpod:
+            stopped = await runpod.stop_instances(["a", "b", "missing"], logger)
+            destroyed = await runpod.destroy_instances(["a", "c", "missing"], logger)
+
+        assert stopped == {"a": True, "b": False, "missing": False}
+        assert destroyed == {"a": True, "c": True, "missing": False}
+        assert list(transport.pods) == ["b"]
+        assert transport.requests == [["podStop"] * 3, ["podTerminate"] * 3]
+
+    run(test)
+
+
+def test_batched_mutations_are_split_by_max_batch_size():
+    podIds = [str(i) for i in range(MAX_BATCH_SIZE + 1)]
+
+    async def test():
+        transport = FakeTransport(*(make_pod(podId) for podId in podIds))
+        async with RunPod(transport) as runpod:
+            stopped = await runpod.stop_instances(podIds, logger)
+
+        assert stopped == {podId: True for podId in podIds}
+        assert [len(request) for request in transport.requests] == [MAX_BATCH_SIZE, 1]
+
+    run(test)
+
+
+def test_start_instances_batch_and_report_each_pod():
+    async def test():
+        transport = FakeTransport(
+            make_pod("a", "EXITED"), make_pod("b", "EXITED"), make_pod("c", "RUNNING"), make_pod("d", "EXITED")
+        )
+        transport.null_payloads = {"b"}
+        async with RunPod(transport) as runpod:
+            started = await runpod.start_instances(["a", "b", "c", "missing"], [1, 1, 1, 1], logger)
+            spot_started = await runpod.start_instances(["d"], [1], logger, max_bid=0.3, spot=True)
+
+        # c was already running, b's start has a null payload
+        assert started == {"a": True, "b": False, "c": True, "missing": False}
+        assert spot_started == {"d": True}
+        assert transport.pods["d"]["desiredStatus"] == "RUNNING"
+        assert transport.requests == [["podResume"] * 4, ["podBidResume"]]
+
+    run(test)
+
+
+def test_get_prices_bulk_prices_each_gpu_type_in_one_request():
+    async def test():
+        transport = FakeTransport()
+        transport.gpu_types = {
+            GPUTypeId.RTX_3090.value: {
+                "secureCloud": True,
+                "communityCloud": True,
+                "lowestPrice": {"minimumBidPrice": 0.2, "uninterruptablePrice": 0.4},
+            },
+            GPUTypeId.A100_80GB.value: {
+                "secureCloud": True,
+                "communityCloud": False,
+                "lowestPrice": {"minimumBidPrice": None, "uninterruptablePrice": 1.9},
+            },
+        }
+        gpuTypeIds = [GPUTypeId.RTX_3090, GPUTypeId.A100_80GB, GPUTypeId.A40]
+        async with RunPod(transport) as runpod:
+            prices = await runpod.get_prices_bulk(gpuTypeIds, logger)
+
+        assert prices == {
+            GPUTypeId.RTX_3090: (0.2, 0.4),
+            GPUTypeId.A100_80GB: (None, 1.9),
+            # Not offered, no gpu type is returned
+            GPUTypeId.A40: (None, None),
+        }
+        assert transport.requests == [["gpuTypes"] * 3]
+
+    run(test)
+
+
+def test_pod_ip_address_defaults_and_can_be_set():
+    async def test():
+        async with RunPod(FakeTransport(make_pod("a"))) as runpod:
+            return await runpod.get_pod_by_id("a", logger)
+
+    pod = asyncio.run(test())
+    assert pod.ip_address == "ssh.runpod.io"
+    pod.ip_address = "10.0.0.1"
+    assert pod.ip_address == "10.0.0.1"
+
+
+def create_instance(runpod: RunPod, podName: str, **kwargs):
+    return runpod.create_instance(
+        max_bid=0.3,
+        podName=podName,
+        imageName="image",
+        containerDiskSize=10,
+        volumeSize=10,
+        volumePath="/workspace",
+        gpuCount=1,
+        gpuTypeId=GPUTypeId.RTX_3090,
+        minVcpuCount=1,
+        minMemoryInGb=1,
+        args="",
+        logger=logger,
+        **kwargs,
+    )
+
+
+def test_create_instance_times_out_when_the_pod_does_not_show_up(monkeypatch):
+    monkeypatch.setattr(runpod_module, "POD_POLL_INITIAL_DELAY", 0.01)
+
+    async def test():
+        transport = FakeTransport()
+        transport.hidden = {"a"}
+        async with RunPod(transport) as runpod:
+            with pytest.raises(RunPodTimeoutException):
+                await create_instance(runpod, "a", timeout=0.1)
+
+        assert transport.requests[0] == ["podRentInterruptable"]
+        assert len(transport.requests) > 2
+
+    run(test)
+
+
+def test_pod_waiter_polls_a_late_pod_without_the_grown_backoff(monkeypatch):
+    monkeypatch.setattr(runpod_module, "POD_POLL_INITIAL_DELAY", 0.01)
+    monkeypatch.setattr(runpod_module, "POD_POLL_MAX_DELAY", 60.0)
+
+    async def test():
+        transport = FakeTransport()
+        transport.hidden = {"slow"}
+        async with RunPod(transport) as runpod:
+            slow = asyncio.ensure_future(create_instance(runpod, "slow", timeout=60))
+            # slow is polled at 0, 10, 30, 70, 150 and 310ms, then not before 630ms
+            await asyncio.sleep(0.4)
+
+            fast = await asyncio.wait_for(create_instance(runpod, "fast", timeout=60), 0.2)
+            assert fast.podId == "fast"
+            assert not slow.done()
+            slow.cancel()
+
+    run(test)